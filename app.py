@@ -3,38 +3,104 @@ from contextlib import asynccontextmanager
 from random import randbytes
 from typing import Callable
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 import database.scripts as scripts
-from database import disconnect_db
-from routers import auth_router, health_router, users_router
+from database import disconnect_db, replicas
+from database.notifications import listener
+from routers import api_keys_router, auth_router, debug_router, health_router, users_router
 from service_logging import logger
+from service_tracing import tracer
+from transport import internal_server
+from utils.activity import login_activity
+from utils.admission import AdmissionRejectedError
+from utils.api_keys import api_keys
+from utils.cache import user_cache  # noqa: F401 - подписывает кэш на уведомления
+from utils.deadlines import (
+    DeadlineExceededError,
+    DeadlineMiddleware,
+    deadline_exceeded_response,
+)
+from utils.idempotency import IdempotencyKeyMismatchError, idempotency
+from utils.loop_monitor import loop_monitor
+from utils.revocation import revocation_list
+from utils.user_events import user_events
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     # on_startup
     logger.info("FastAPI application starting up...")
+    loop_monitor.start()
     await scripts.init_default_admin()
+    await replicas.start()
+    await revocation_list.start()
+    await api_keys.start()
+    await user_events.start()
+    login_activity.start()
+    idempotency.start()
+    await listener.start()
+    await internal_server.start()
 
     yield
 
     # on_shutdown
     logger.info("FastAPI application shutting down...")
+    await internal_server.stop()
+    await listener.stop()
+    await revocation_list.stop()
+    await api_keys.stop()
+    await user_events.stop()
+    await login_activity.stop()
+    await idempotency.stop()
     await disconnect_db()
+    await loop_monitor.stop()
 
 
 service = FastAPI(lifespan=lifespan)
+service.add_middleware(DeadlineMiddleware)
 
 
 @service.middleware("http")
 async def add_request_hash(request: Request, call_next: Callable):
     request_hash = hashlib.sha1(randbytes(32)).hexdigest()[:10]
     with logger.contextualize(request_hash=request_hash):
-        response = await call_next(request)
-        return response
+        # Трасса запроса идентифицируется его хешем, как и его логи
+        with tracer.trace(request_hash, f"{request.method} {request.url.path}") as span:
+            response = await call_next(request)
+            if span is not None:
+                span.attributes["status_code"] = response.status_code
+            return response
+
+
+@service.exception_handler(AdmissionRejectedError)
+async def admission_rejected_handler(_: Request, error: AdmissionRejectedError):
+    logger.warning(error.detail)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": error.detail},
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+@service.exception_handler(IdempotencyKeyMismatchError)
+async def idempotency_key_mismatch_handler(_: Request, error: IdempotencyKeyMismatchError):
+    logger.error(error.detail)
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": error.detail},
+    )
+
+
+@service.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(_: Request, error: DeadlineExceededError):
+    logger.error(error.detail)
+    return deadline_exceeded_response()
 
 
 service.include_router(auth_router)
 service.include_router(users_router)
 service.include_router(health_router)
+service.include_router(debug_router)
+service.include_router(api_keys_router)
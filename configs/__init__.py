@@ -1,9 +1,21 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .activity import ActivityConfiguration
+from .admission import AdmissionConfiguration
+from .api_keys import ApiKeysConfiguration
+from .cache import CacheConfiguration
 from .database import DatabaseConfiguration
+from .deadlines import DeadlineConfiguration
 from .default import DefaultConfiguration
 from .graylog import GraylogConfiguration
+from .idempotency import IdempotencyConfiguration
+from .internal import InternalTransportConfiguration
 from .jwt import JwtConfiguration
+from .loop_monitor import LoopMonitorConfiguration
+from .revocation import RevocationConfiguration
+from .tracing import TracingConfiguration
+from .user_events import UserEventsConfiguration
+from .users import UsersConfiguration
 
 
 class ProjectConfiguration(BaseSettings):
@@ -14,6 +26,18 @@ class ProjectConfiguration(BaseSettings):
     jwt: JwtConfiguration = JwtConfiguration()
     default: DefaultConfiguration = DefaultConfiguration()
     graylog: GraylogConfiguration = GraylogConfiguration()
+    revocation: RevocationConfiguration = RevocationConfiguration()
+    cache: CacheConfiguration = CacheConfiguration()
+    internal: InternalTransportConfiguration = InternalTransportConfiguration()
+    admission: AdmissionConfiguration = AdmissionConfiguration()
+    activity: ActivityConfiguration = ActivityConfiguration()
+    users: UsersConfiguration = UsersConfiguration()
+    deadline: DeadlineConfiguration = DeadlineConfiguration()
+    tracing: TracingConfiguration = TracingConfiguration()
+    loop_monitor: LoopMonitorConfiguration = LoopMonitorConfiguration()
+    api_keys: ApiKeysConfiguration = ApiKeysConfiguration()
+    user_events: UserEventsConfiguration = UserEventsConfiguration()
+    idempotency: IdempotencyConfiguration = IdempotencyConfiguration()
 
     # * Опциональные переменные
     DEBUG_MODE: bool = True
@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ActivityConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_ACTIVITY_")
+
+    # * Опциональные переменные
+    FLUSH_INTERVAL: float = 5.0
+    FLUSH_BATCH_SIZE: int = 1000
+    MAX_PENDING: int = 10_000
@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AdmissionConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_ADMISSION_")
+
+    # * Опциональные переменные
+    PASSWORD_CONCURRENCY: int = 4
+    PASSWORD_QUEUE_SIZE: int = 64
+    PASSWORD_MAX_WAIT: float = 2.0
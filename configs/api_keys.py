@@ -0,0 +1,12 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ApiKeysConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_API_KEYS_")
+
+    # * Опциональные переменные
+    SECRET: Optional[str] = None
+    PREFIX: str = "ilps"
+    REFRESH_INTERVAL: float = 5.0
@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_CACHE_")
+
+    # * Опциональные переменные
+    USERS_MAX_SIZE: int = 10_000
+    USERS_TTL: float = 60.0
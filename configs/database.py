@@ -12,6 +12,11 @@ class DatabaseConfiguration(BaseSettings):
     POSTGRES_USER: str = "service_auth"
     POSTGRES_NAME: str = "auth"
     POSTGRES_PORT: int = 5432
+    LISTENER_RECONNECT_DELAY: float = 1.0
+    LISTENER_PING_INTERVAL: float = 10.0
+    REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG: float = 5.0
+    REPLICA_CHECK_INTERVAL: float = 2.0
 
     @property
     def URL(self) -> str:
@@ -22,3 +27,13 @@ class DatabaseConfiguration(BaseSettings):
             port=self.POSTGRES_PORT,
             db_name=self.POSTGRES_NAME,
         )
+
+    @property
+    def DSN(self) -> str:
+        return "postgresql://{user}:{password}@{host}:{port}/{db_name}".format(
+            user=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_HOST,
+            port=self.POSTGRES_PORT,
+            db_name=self.POSTGRES_NAME,
+        )
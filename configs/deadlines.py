@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DeadlineConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_DEADLINE_")
+
+    # * Опциональные переменные
+    DEFAULT: float = 10.0
+    # Маршруты без бюджета (`None`) не ограничиваются по времени
+    ROUTES: dict[str, Optional[float]] = {
+        "/login": 3.0,
+        "/register": 5.0,
+        "/verify": 1.0,
+        "/users/lookup": 2.0,
+        "/users/events": None,
+    }
+    HEADER: str = "X-Request-Timeout"
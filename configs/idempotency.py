@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class IdempotencyConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_IDEMPOTENCY_")
+
+    # * Опциональные переменные
+    TTL: float = 3600.0
+    LEASE: float = 30.0
+    POLL_INTERVAL: float = 0.05
+    MAX_POLL_INTERVAL: float = 1.0
+    PRUNE_INTERVAL: float = 300.0
@@ -0,0 +1,15 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class InternalTransportConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_INTERNAL_")
+
+    # * Опциональные переменные
+    ENABLE: bool = False
+    SOCKET_PATH: Optional[str] = None
+    HOST: str = "127.0.0.1"
+    PORT: int = 8063
+    MAX_FRAME_SIZE: int = 16 * 1024
+    MAX_INFLIGHT: int = 256
@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class LoopMonitorConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_LOOP_MONITOR_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    INTERVAL: float = 0.1
+    THRESHOLD: float = 0.1
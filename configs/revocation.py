@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RevocationConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_REVOCATION_")
+
+    # * Опциональные переменные
+    REFRESH_INTERVAL: float = 5.0
+    REFRESH_LOOKBACK: float = 30.0
+    PRUNE_INTERVAL: float = 300.0
+    BLOOM_CAPACITY: int = 100_000
+    BLOOM_ERROR_RATE: float = 0.001
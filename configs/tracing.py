@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class TracingConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_TRACING_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    SLOW_REQUEST_THRESHOLD: float = 1.0
+    MAX_SPANS: int = 512
+    OTLP_FILE_PATH: Optional[str] = None
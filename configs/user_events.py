@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class UserEventsConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_USER_EVENTS_")
+
+    # * Опциональные переменные
+    RETENTION: float = 86_400.0
+    PRUNE_INTERVAL: float = 300.0
+    REPLAY_LIMIT: int = 10_000
+    REPLAY_LOOKBACK: float = 60.0
+    QUEUE_SIZE: int = 1000
+    HEARTBEAT_INTERVAL: float = 15.0
@@ -0,0 +1,8 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class UsersConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="AUTH_USERS_")
+
+    # * Опциональные переменные
+    LOOKUP_MAX_IDS: int = 200
@@ -1,3 +1,12 @@
-from .engine import BaseORM, disconnect_db, get_db
+from .engine import BaseORM, create_read_session, disconnect_db, get_db, get_read_db, replicas
+from .session import LazySession
 
-__all__ = ("BaseORM", "disconnect_db", "get_db")
+__all__ = (
+    "BaseORM",
+    "LazySession",
+    "create_read_session",
+    "disconnect_db",
+    "get_db",
+    "get_read_db",
+    "replicas",
+)
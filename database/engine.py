@@ -1,7 +1,16 @@
+from typing import Optional
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext, ExecutionContext
 from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from configs import configs
+from service_tracing import tracer
+from utils.deadlines import DeadlineExceededError, remaining, statement_timeout_ms
+
+from .replicas import ReplicaSet
+from .session import LazySession
 
 engine: AsyncEngine = create_async_engine(
     configs.database.URL,
@@ -17,6 +26,150 @@ LocalAsyncSession: AsyncSession = sessionmaker(
     autocommit=False,
 )
 
+replicas = ReplicaSet(configs.database.REPLICA_URLS, primary_session_factory=LocalAsyncSession)
+
+
+# Ключи `info` DBAPI соединения: таймаут, действующий в сессии PostgreSQL,
+# таймаут, установленный в текущей транзакции до ее фиксации, и флаг
+# транзакции, таймаут которой еще не сверен с остатком бюджета
+STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+PENDING_STATEMENT_TIMEOUT_KEY = "pending_statement_timeout_ms"
+UNCHECKED_STATEMENT_TIMEOUT_KEY = "unchecked_statement_timeout"
+
+# Допустимое расхождение действующего таймаута с остатком бюджета
+STATEMENT_TIMEOUT_TOLERANCE_MS = 100
+STATEMENT_TIMEOUT_TOLERANCE_RATIO = 0.1
+
+# SQLSTATE `query_canceled`, в том числе по `statement_timeout`
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+def is_timeout_close(applied: Optional[int], timeout: Optional[int]) -> bool:
+    """Проверяет, что действующий таймаут достаточно близок к требуемому.
+
+    Args:
+        applied (Optional[int]): Действующий таймаут в миллисекундах.
+        timeout (Optional[int]): Требуемый таймаут в миллисекундах.
+
+    Returns:
+        bool: Флаг отсутствия необходимости менять таймаут.
+    """
+    if applied is None or timeout is None:
+        return applied == timeout
+
+    tolerance = max(STATEMENT_TIMEOUT_TOLERANCE_MS, timeout * STATEMENT_TIMEOUT_TOLERANCE_RATIO)
+    return abs(applied - timeout) <= tolerance
+
+
+@event.listens_for(Engine, "begin")
+def begin_statement_timeout(connection: Connection) -> None:
+    """Отмечает начатую транзакцию для сверки таймаута ее запросов."""
+    connection.info[UNCHECKED_STATEMENT_TIMEOUT_KEY] = True
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def apply_statement_timeout(
+    connection: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """Ограничивает время выполнения запросов транзакции остатком бюджета
+    текущего HTTP запроса, чтобы медленный запрос не удерживал соединение
+    после того, как ответ клиенту уже не нужен. Вне запроса таймаут
+    сбрасывается к значению по умолчанию.
+
+    Таймаут сверяется перед первым SQL выражением каждой транзакции любого
+    пользователя соединения. Он устанавливается на уровне сессии PostgreSQL
+    и сохраняется между транзакциями, поэтому лишний запрос выполняется
+    только тогда, когда остаток бюджета заметно отличается от действующего
+    таймаута.
+    """
+    if connection.info.pop(UNCHECKED_STATEMENT_TIMEOUT_KEY, None) is None:
+        return
+
+    timeout = statement_timeout_ms()
+    if is_timeout_close(connection.info.get(STATEMENT_TIMEOUT_KEY), timeout):
+        return
+
+    # Отдельный курсор DBAPI соединения: курсор выражения может быть серверным
+    timeout_cursor = connection.connection.cursor()
+    try:
+        if timeout is None:
+            timeout_cursor.execute("SET statement_timeout = DEFAULT")
+        else:
+            timeout_cursor.execute(f"SET statement_timeout = {timeout}")
+    finally:
+        timeout_cursor.close()
+
+    # Установка внутри транзакции отменяется ее откатом
+    connection.info[PENDING_STATEMENT_TIMEOUT_KEY] = timeout
+
+
+@event.listens_for(Engine, "commit")
+def commit_statement_timeout(connection: Connection) -> None:
+    """Запоминает таймаут, установленный в зафиксированной транзакции."""
+    connection.info.pop(UNCHECKED_STATEMENT_TIMEOUT_KEY, None)
+    if PENDING_STATEMENT_TIMEOUT_KEY in connection.info:
+        connection.info[STATEMENT_TIMEOUT_KEY] = connection.info.pop(
+            PENDING_STATEMENT_TIMEOUT_KEY
+        )
+
+
+@event.listens_for(Engine, "rollback")
+def rollback_statement_timeout(connection: Connection) -> None:
+    """Отбрасывает таймаут, установленный в откаченной транзакции."""
+    connection.info.pop(PENDING_STATEMENT_TIMEOUT_KEY, None)
+    connection.info.pop(UNCHECKED_STATEMENT_TIMEOUT_KEY, None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement_span(
+    connection: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """Открывает отрезок трассы запроса на время выполнения SQL выражения."""
+    context.trace_span = tracer.start_span("sql", statement=statement[:200])
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def end_statement_span(
+    connection: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    """Закрывает отрезок трассы выполненного SQL выражения."""
+    tracer.end_span(getattr(context, "trace_span", None))
+
+
+@event.listens_for(Engine, "handle_error")
+def fail_statement_span(exception_context: ExceptionContext) -> None:
+    """Закрывает отрезок трассы SQL выражения, завершившегося ошибкой."""
+    context = exception_context.execution_context
+    tracer.end_span(getattr(context, "trace_span", None), exception_context.original_exception)
+
+
+@event.listens_for(Engine, "handle_error")
+def raise_deadline_exceeded(exception_context: ExceptionContext) -> None:
+    """Заменяет отмену SQL выражения по таймауту, выставленному из бюджета
+    запроса, ошибкой исчерпания бюджета, чтобы она не перехватывалась
+    обработчиками ошибок базы данных.
+    """
+    sqlstate = getattr(exception_context.original_exception, "sqlstate", None)
+    if sqlstate == QUERY_CANCELED_SQLSTATE and remaining() is not None:
+        raise DeadlineExceededError(
+            "Database statement exceeded the request deadline."
+        ) from exception_context.sqlalchemy_exception
+
 
 class BaseORM(AsyncAttrs, DeclarativeBase):
     """Базовый класс модели ORM.
@@ -29,15 +182,47 @@ class BaseORM(AsyncAttrs, DeclarativeBase):
 
 async def disconnect_db():
     """Закрывает подключение к БД, освобождает ресурсы."""
+    await replicas.stop()
     await engine.dispose()
 
 
 async def get_db():
-    """Функция возвращает асинхронную сессию взаимодействия с БД
-    вместе с контролем интерпретатору.
+    """Функция возвращает ленивую асинхронную сессию взаимодействия с БД
+    вместе с контролем интерпретатору. Соединение берется из пула только
+    при первом запросе и возвращается при фиксации транзакции.
+
+    Yields:
+        LazySession: Ленивая асинхронная сессия работы с БД.
+    """
+    session = LazySession(LocalAsyncSession)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def create_read_session() -> LazySession:
+    """Создает ленивую сессию только для чтения на одной из здоровых реплик
+    или на основном сервере, если таких нет. Соединение возвращается в пул
+    сразу после каждого запроса.
+
+    Returns:
+        LazySession: Ленивая асинхронная сессия работы с БД.
+    """
+    return LazySession(lambda: replicas.session_factory()(), autorelease=True)
+
+
+async def get_read_db():
+    """Функция возвращает ленивую асинхронную сессию только для чтения
+    вместе с контролем интерпретатору. Сессия открывается на одной из
+    здоровых реплик или на основном сервере, если таких нет, а соединение
+    возвращается в пул сразу после каждого запроса.
 
     Yields:
-        AsyncSession: Асинхронная сессия работы с БД.
+        LazySession: Ленивая асинхронная сессия работы с БД.
     """
-    async with LocalAsyncSession() as session:
+    session = create_read_session()
+    try:
         yield session
+    finally:
+        await session.close()
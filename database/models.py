@@ -1,7 +1,20 @@
 import uuid
 
-from sqlalchemy import Boolean, CheckConstraint, Column, ForeignKey, Index, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from .engine import BaseORM
@@ -18,15 +31,31 @@ class User(BaseORM):
     email = Column(String(255), unique=True, nullable=False)
     is_admin = Column(Boolean, nullable=False, default=False)
     is_disabled = Column(Boolean, nullable=False, default=False)
+    version = Column(Integer, nullable=False, server_default=text("1"))
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+    failed_login_attempts = Column(Integer, nullable=False, server_default=text("0"))
 
     # * Relations
     password = relationship("Password", back_populates="user", uselist=False)
 
     # * Constraints
     __table_args__ = (
-        Index("user_id_idx", id, postgresql_using="hash"),
-        Index("user_name_idx", name, postgresql_using="hash"),
-        Index("user_email_idx", email, postgresql_using="hash"),
+        Index("user_name_prefix_idx", text("lower(name) text_pattern_ops")),
+        Index("user_email_prefix_idx", text("lower(email) text_pattern_ops")),
+        Index(
+            "user_name_trgm_idx",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "user_email_trgm_idx",
+            email,
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        Index("user_admin_name_idx", name, postgresql_where=text("is_admin")),
+        Index("user_disabled_name_idx", name, postgresql_where=text("is_disabled")),
         CheckConstraint(
             r"email ~ '^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'",
             name="check_email_format",
@@ -47,13 +76,78 @@ class Password(BaseORM):
         nullable=False,
         unique=True,
     )
-    hash = Column(Text, unique=True, nullable=False)
+    hash = Column(Text, nullable=False)
 
     # * Relations
     user = relationship("User", back_populates="password", uselist=False)
 
+
+class RevokedToken(BaseORM):
+    """ORM модель, описывающая отозванный токен доступа."""
+
+    __tablename__ = "revoked_tokens"
+
+    # * Columns
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    jti = Column(String(32), unique=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
     # * Constraints
     __table_args__ = (
-        Index("password_id_idx", id, postgresql_using="hash"),
-        Index("password_hash_idx", hash, postgresql_using="hash"),
+        Index("revoked_token_expires_at_idx", expires_at),
+        Index("revoked_token_revoked_at_idx", revoked_at),
     )
+
+
+class ApiKey(BaseORM):
+    """ORM модель, описывающая API ключ сервисного аккаунта."""
+
+    __tablename__ = "api_keys"
+
+    # * Columns
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    key_id = Column(String(16), unique=True, nullable=False)
+    name = Column(String(255), nullable=False)
+    digest = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class UserEvent(BaseORM):
+    """ORM модель, описывающая событие изменения пользователя.
+    Записи создаются триггерами таблицы `users`.
+    """
+
+    __tablename__ = "user_events"
+
+    # * Columns
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    version = Column(Integer, nullable=False)
+    is_admin = Column(Boolean, nullable=False)
+    is_disabled = Column(Boolean, nullable=False)
+    op = Column(String(6), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # * Constraints
+    __table_args__ = (Index("user_event_created_at_idx", created_at),)
+
+
+class IdempotencyKey(BaseORM):
+    """ORM модель, описывающая ключ идемпотентности запроса и сохраненный ответ на него."""
+
+    __tablename__ = "idempotency_keys"
+
+    # * Columns
+    scope = Column(String(32), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    token = Column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
+    status_code = Column(Integer, nullable=True)
+    response = Column(JSONB, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # * Constraints
+    __table_args__ = (Index("idempotency_key_expires_at_idx", expires_at),)
@@ -0,0 +1,117 @@
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+from typing import Callable, Optional
+
+import asyncpg
+
+from configs import configs
+from service_logging import logger
+
+NotificationHandler = Callable[[str], None]
+ReconnectHandler = Callable[[], None]
+
+
+class ChangeListener:
+    """Слушатель уведомлений PostgreSQL (`LISTEN/NOTIFY`).
+
+    Держит отдельное от пула соединение, подписанное на каналы,
+    и передает полезную нагрузку уведомлений обработчикам.
+    При потере соединения переподключается и вызывает обработчики
+    переподключения, так как уведомления, пришедшие во время
+    разрыва, потеряны.
+    """
+
+    def __init__(self, dsn: str):
+        self._dsn = dsn
+        self._handlers: defaultdict[str, list[NotificationHandler]] = defaultdict(list)
+        self._reconnect_handlers: list[ReconnectHandler] = []
+        self._task: Optional[asyncio.Task] = None
+        self.is_connected = False
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        """Регистрирует обработчик уведомлений канала.
+        Подписка должна производиться до запуска слушателя.
+
+        Args:
+            channel (str): Имя канала.
+            handler (NotificationHandler): Обработчик полезной нагрузки уведомления.
+        """
+        self._handlers[channel].append(handler)
+
+    def on_reconnect(self, handler: ReconnectHandler) -> None:
+        """Регистрирует обработчик установки соединения.
+
+        Args:
+            handler (ReconnectHandler): Обработчик, вызываемый после каждого подключения.
+        """
+        self._reconnect_handlers.append(handler)
+
+    async def start(self) -> None:
+        """Запускает фоновую задачу прослушивания каналов."""
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run(), name="change-listener")
+
+    async def stop(self) -> None:
+        """Останавливает прослушивание каналов и закрывает соединение."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def _dispatch(self, _connection, _pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers[channel]:
+            try:
+                handler(payload)
+
+            except Exception as error:
+                logger.error(f"Notification handler of '{channel}' failed: {error!r}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(self._dsn)
+
+            except (OSError, asyncpg.PostgresError) as error:
+                logger.warning(f"Change listener connection failed: {error!r}")
+                await asyncio.sleep(configs.database.LISTENER_RECONNECT_DELAY)
+                continue
+
+            try:
+                await self._listen(connection)
+
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as error:
+                logger.warning(f"Change listener connection lost: {error!r}")
+
+            finally:
+                self.is_connected = False
+                with suppress(Exception):
+                    await connection.close(timeout=1)
+
+            await asyncio.sleep(configs.database.LISTENER_RECONNECT_DELAY)
+
+    async def _listen(self, connection: asyncpg.Connection) -> None:
+        terminated = asyncio.Event()
+        connection.add_termination_listener(lambda _: terminated.set())
+
+        for channel in self._handlers:
+            await connection.add_listener(channel, self._dispatch)
+
+        self.is_connected = True
+        logger.info(f"Change listener subscribed to: {', '.join(self._handlers)}")
+        for handler in self._reconnect_handlers:
+            handler()
+
+        # Периодический запрос выявляет "зависшее" соединение
+        while not terminated.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    terminated.wait(), timeout=configs.database.LISTENER_PING_INTERVAL
+                )
+            await connection.execute("SELECT 1")
+
+
+listener = ChangeListener(configs.database.DSN)
@@ -0,0 +1,251 @@
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import Executable, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from database.engine import engine
+from database.models import RevokedToken, User
+from service_logging import logger
+from utils.users import (
+    user_exists_stmt,
+    user_snapshot_stmt,
+    users_by_ids_criteria,
+    users_count_stmt,
+    users_page_stmt,
+    users_search_criteria,
+)
+
+
+# Объем тестовых данных: на пустых таблицах планировщик выбирает
+# последовательное сканирование независимо от наличия индексов
+SEED_USERS_COUNT = 20_000
+SEED_TOKENS_COUNT = 20_000
+
+SEED_STATEMENTS = (
+    # Имена и почты начинаются с hex символов, поэтому поиск по префиксу избирателен
+    f"""
+    WITH seeded AS (
+        INSERT INTO users (id, name, email, is_admin, is_disabled)
+        SELECT
+            gen_random_uuid(),
+            'seed_' || md5(i::text),
+            md5(i::text) || '@seed.example.com',
+            i % 1000 = 0,
+            i % 100 = 0
+        FROM generate_series(1, {SEED_USERS_COUNT}) AS i
+        RETURNING id
+    )
+    INSERT INTO passwords (user_id, hash) SELECT id, 'seed' FROM seeded
+    """,
+    f"""
+    INSERT INTO revoked_tokens (jti, expires_at, revoked_at)
+    SELECT
+        md5('seed' || i::text),
+        now() + interval '1 hour',
+        now() - i * interval '1 second'
+    FROM generate_series(1, {SEED_TOKENS_COUNT}) AS i
+    """,
+    "ANALYZE users, passwords, revoked_tokens",
+)
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    """Ожидания к плану выполнения горячего запроса.
+
+    План не должен содержать последовательных сканирований, если
+    `allow_seq_scan` не задан, а все используемые индексы должны входить
+    в `indexes`. Если `indexes` не задан, допускается любой индекс.
+    Проверка пропускается, если не установлено расширение `extension`,
+    без которого ожидаемые индексы не создаются.
+    """
+
+    name: str
+    statement: Executable
+    indexes: Optional[frozenset[str]] = None
+    allow_seq_scan: bool = False
+    extension: Optional[str] = None
+
+
+PLAN_CHECKS = (
+    PlanCheck(
+        name="login lookup",
+        statement=user_snapshot_stmt(User.name == "admin"),
+        indexes=frozenset({"users_name_key", "passwords_user_id_key"}),
+    ),
+    PlanCheck(
+        name="verify lookup",
+        statement=user_snapshot_stmt(User.id == UUID(int=0)),
+        indexes=frozenset({"users_pkey", "passwords_user_id_key"}),
+    ),
+    PlanCheck(
+        name="bulk lookup",
+        statement=user_snapshot_stmt(users_by_ids_criteria([UUID(int=0), UUID(int=1)])),
+        indexes=frozenset({"users_pkey", "passwords_user_id_key"}),
+    ),
+    PlanCheck(
+        name="registration conflict",
+        statement=user_exists_stmt("admin", "admin@example.com"),
+        indexes=frozenset({"users_name_key", "users_email_key"}),
+    ),
+    PlanCheck(
+        name="list page",
+        statement=users_page_stmt(skip=0, size=50),
+        indexes=frozenset({"users_name_key"}),
+    ),
+    # Подсчет всех пользователей читает всю таблицу при любых индексах
+    PlanCheck(
+        name="count",
+        statement=users_count_stmt(),
+        allow_seq_scan=True,
+    ),
+    PlanCheck(
+        name="prefix search",
+        statement=users_count_stmt(*users_search_criteria(q="ad")),
+        indexes=frozenset({"user_name_prefix_idx", "user_email_prefix_idx"}),
+    ),
+    PlanCheck(
+        name="substring search",
+        statement=users_count_stmt(*users_search_criteria(q="admin")),
+        indexes=frozenset({"user_name_trgm_idx", "user_email_trgm_idx"}),
+        extension="pg_trgm",
+    ),
+    PlanCheck(
+        name="admins filter",
+        statement=users_count_stmt(*users_search_criteria(is_admin=True)),
+        indexes=frozenset({"user_admin_name_idx"}),
+    ),
+    PlanCheck(
+        name="revocation lookup",
+        statement=select(RevokedToken.id).where(RevokedToken.jti == "0" * 32),
+        indexes=frozenset({"revoked_tokens_jti_key"}),
+    ),
+    PlanCheck(
+        name="revocation refresh",
+        statement=select(RevokedToken.jti).where(
+            RevokedToken.revoked_at > func.now() - timedelta(seconds=30)
+        ),
+        indexes=frozenset({"revoked_token_revoked_at_idx"}),
+    ),
+)
+
+
+def walk_plan(node: dict) -> Iterator[dict]:
+    """Обходит все узлы дерева плана выполнения.
+
+    Args:
+        node (dict): Корневой узел плана в формате `EXPLAIN (FORMAT JSON)`.
+
+    Yields:
+        dict: Узел плана.
+    """
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk_plan(child)
+
+
+async def explain(connection: AsyncConnection, statement: Executable) -> dict:
+    """Возвращает план выполнения запроса без его исполнения.
+
+    Args:
+        connection (AsyncConnection): Асинхронное подключение к БД.
+        statement (Executable): Проверяемый запрос.
+
+    Returns:
+        dict: Корневой узел плана.
+    """
+    sql = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]["Plan"]
+
+
+def find_regressions(check: PlanCheck, plan: dict) -> list[str]:
+    """Сравнивает план выполнения с ожиданиями проверки.
+
+    Args:
+        check (PlanCheck): Проверка горячего запроса.
+        plan (dict): Корневой узел плана.
+
+    Returns:
+        list[str]: Описания найденных регрессий.
+    """
+    regressions = []
+    for node in walk_plan(plan):
+        if node["Node Type"] == "Seq Scan" and not check.allow_seq_scan:
+            regressions.append(f"sequential scan on '{node.get('Relation Name')}'")
+
+        index_name = node.get("Index Name")
+        is_expected = check.indexes is None or index_name in check.indexes
+        if index_name is not None and not is_expected:
+            regressions.append(f"unexpected index '{index_name}'")
+
+    return regressions
+
+
+async def collect_regressions() -> dict[str, Optional[list[str]]]:
+    """Проверяет планы выполнения всех горячих запросов на тестовых данных.
+
+    Данные создаются и анализируются в транзакции, которая затем
+    откатывается, поэтому проверка не меняет содержимое базы данных.
+    Планировщик работает с настройками по умолчанию.
+
+    Returns:
+        dict[str, Optional[list[str]]]: Регрессии по именам проверок.
+            `None` для проверок, пропущенных из-за отсутствия расширения.
+    """
+    regressions = {}
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            extensions = set(
+                (await connection.exec_driver_sql("SELECT extname FROM pg_extension")).scalars()
+            )
+            for statement in SEED_STATEMENTS:
+                await connection.exec_driver_sql(statement)
+
+            for check in PLAN_CHECKS:
+                if check.extension is not None and check.extension not in extensions:
+                    regressions[check.name] = None
+                    continue
+
+                plan = await explain(connection, check.statement)
+                regressions[check.name] = find_regressions(check, plan)
+
+        finally:
+            await transaction.rollback()
+
+    return regressions
+
+
+async def run_plan_checks() -> bool:
+    """Проверяет планы выполнения всех горячих запросов и логирует результаты.
+
+    Returns:
+        bool: Флаг отсутствия регрессий.
+    """
+    is_passed = True
+    for name, regressions in (await collect_regressions()).items():
+        if regressions is None:
+            logger.warning(f"Plan check '{name}' skipped: required extension is not installed.")
+        elif regressions:
+            is_passed = False
+            logger.error(f"Plan check '{name}' failed: {'; '.join(regressions)}")
+        else:
+            logger.success(f"Plan check '{name}' passed.")
+
+    await engine.dispose()
+    return is_passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_plan_checks()) else 1)
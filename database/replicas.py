@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from configs import configs
+from service_logging import logger
+from utils.tasks import PeriodicTask
+
+# Отставание реплики в секундах. Простаивающая реплика, проигравшая весь
+# полученный WAL, считается не отстающей, иначе ее отставание росло бы
+# вместе со временем с последней транзакции на основном сервере. Это верно
+# только при работающем приеме WAL: реплика с отключенным приемником тоже
+# проиграла все полученное, но отстает неограниченно, поэтому для нее
+# возвращается `NULL`. Без роли `pg_read_all_stats` статус приемника скрыт,
+# и тогда учитывается только наличие его процесса.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver
+            WHERE pid IS NOT NULL AND COALESCE(status, 'streaming') = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END::float
+    """
+)
+
+
+class Replica:
+    """Реплика базы данных только для чтения."""
+
+    def __init__(self, url: str):
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            echo=configs.DEBUG_MODE,
+            pool_pre_ping=True,
+        )
+        self.session_factory = sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+            autocommit=False,
+        )
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.is_healthy = False
+        self.lag: Optional[float] = None
+
+    async def check(self) -> None:
+        """Проверяет доступность реплики и ее отставание от основного сервера."""
+        try:
+            # Ограничивается и подключение: недоступная реплика не должна задерживать проверки
+            async with asyncio.timeout(configs.database.REPLICA_CHECK_INTERVAL):
+                async with self.engine.connect() as connection:
+                    result = await connection.execute(LAG_QUERY)
+                    self.lag = result.scalar_one()
+
+        except Exception as error:
+            self.lag = None
+            self._set_health(False, f"check failed: {error!r}")
+            return
+
+        if self.lag is None:
+            self._set_health(False, "WAL receiver is not streaming")
+        elif self.lag > configs.database.REPLICA_MAX_LAG:
+            self._set_health(False, f"lag {self.lag:.2f}s exceeds tolerance")
+        else:
+            self._set_health(True, f"lag {self.lag:.2f}s")
+
+    def _set_health(self, is_healthy: bool, reason: str) -> None:
+        if is_healthy != self.is_healthy:
+            state = "restored" if is_healthy else "ejected"
+            logger.warning(f"Replica {self.name} {state}: {reason}")
+        self.is_healthy = is_healthy
+
+
+class ReplicaSet:
+    """Набор реплик для распределения запросов только на чтение.
+
+    Сессии выдаются по кругу среди здоровых реплик. Реплики, которые
+    недоступны или отстают сильнее допустимого, исключаются из ротации
+    до следующей успешной проверки. Если здоровых реплик нет, сессии
+    открываются на основном сервере.
+    """
+
+    def __init__(self, urls: list[str], primary_session_factory: sessionmaker):
+        self.replicas = [Replica(url) for url in urls]
+        self._primary_session_factory = primary_session_factory
+        self._counter = itertools.count()
+        self._check_task = PeriodicTask(
+            "replica-health-check", configs.database.REPLICA_CHECK_INTERVAL, self.check
+        )
+
+    def stats(self) -> list[dict]:
+        """Возвращает состояние каждой реплики."""
+        return [
+            {"name": replica.name, "is_healthy": replica.is_healthy, "lag": replica.lag}
+            for replica in self.replicas
+        ]
+
+    def session_factory(self) -> sessionmaker:
+        """Возвращает фабрику сессий очередной здоровой реплики
+        или основного сервера, если таких нет.
+        """
+        healthy = [replica for replica in self.replicas if replica.is_healthy]
+        if not healthy:
+            return self._primary_session_factory
+
+        return healthy[next(self._counter) % len(healthy)].session_factory
+
+    async def check(self) -> None:
+        """Проверяет состояние всех реплик."""
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def start(self) -> None:
+        """Проверяет реплики и запускает их периодическую проверку."""
+        if not self.replicas:
+            return
+
+        await self.check()
+        self._check_task.start()
+
+    async def stop(self) -> None:
+        """Останавливает проверку реплик и закрывает их подключения."""
+        await self._check_task.stop()
+        for replica in self.replicas:
+            await replica.engine.dispose()
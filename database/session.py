@@ -0,0 +1,76 @@
+from typing import Any, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service_tracing import tracer
+
+
+class LazySession:
+    """Ленивая обертка над асинхронной сессией.
+
+    Повторяет интерфейс `AsyncSession`, но создает сессию только при
+    первом обращении к ней, поэтому запросы, отклоненные до работы с БД
+    (невалидный токен, попадание в кэш), не тратят время на сессию.
+
+    Соединение берется из пула при первом запросе и возвращается в него
+    вызовом `release()`. В режиме `autorelease` соединение возвращается
+    сразу после каждого запроса: это подходит для сессий только на чтение,
+    результаты которых полностью буферизуются драйвером.
+    """
+
+    def __init__(self, factory: Callable[[], AsyncSession], autorelease: bool = False):
+        self._factory = factory
+        self._autorelease = autorelease
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        """Асинхронная сессия, создаваемая при первом обращении."""
+        if self._session is None:
+            self._session = self._factory()
+
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def execute(self, *args, **kwargs):
+        # Отрезок включает ожидание соединения из пула и начало транзакции
+        with tracer.span("db.execute"):
+            result = await self.session.execute(*args, **kwargs)
+            if self._autorelease:
+                await self.release()
+
+        return result
+
+    async def scalar(self, *args, **kwargs):
+        # Отрезок включает ожидание соединения из пула и начало транзакции
+        with tracer.span("db.scalar"):
+            result = await self.session.scalar(*args, **kwargs)
+            if self._autorelease:
+                await self.release()
+
+        return result
+
+    async def scalars(self, *args, **kwargs):
+        # Отрезок включает ожидание соединения из пула и начало транзакции
+        with tracer.span("db.scalars"):
+            result = await self.session.scalars(*args, **kwargs)
+            if self._autorelease:
+                await self.release()
+
+        return result
+
+    async def release(self) -> None:
+        """Завершает текущую транзакцию, возвращая соединение в пул.
+        Загруженные объекты остаются доступны, так как сессии
+        не истекают при фиксации.
+        """
+        if self._session is not None and self._session.in_transaction():
+            await self._session.commit()
+
+    async def close(self) -> None:
+        """Закрывает сессию, если она была создана."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
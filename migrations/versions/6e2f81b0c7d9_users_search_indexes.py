@@ -0,0 +1,85 @@
+"""users search indexes
+
+Revision ID: 6e2f81b0c7d9
+Revises: d5a7c93e18f4
+Create Date: 2026-10-19 14:41:12.306771
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e2f81b0c7d9"
+down_revision: Union[str, None] = "d5a7c93e18f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Индексы строятся без блокировки записи в таблицу пользователей
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "user_name_prefix_idx",
+            "users",
+            [sa.text("lower(name) text_pattern_ops")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "user_email_prefix_idx",
+            "users",
+            [sa.text("lower(email) text_pattern_ops")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "user_name_trgm_idx",
+            "users",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "user_email_trgm_idx",
+            "users",
+            ["email"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "user_admin_name_idx",
+            "users",
+            ["name"],
+            unique=False,
+            postgresql_where=sa.text("is_admin"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "user_disabled_name_idx",
+            "users",
+            ["name"],
+            unique=False,
+            postgresql_where=sa.text("is_disabled"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("user_disabled_name_idx", table_name="users")
+    op.drop_index("user_admin_name_idx", table_name="users")
+    op.drop_index("user_email_trgm_idx", table_name="users")
+    op.drop_index("user_name_trgm_idx", table_name="users")
+    op.drop_index("user_email_prefix_idx", table_name="users")
+    op.drop_index("user_name_prefix_idx", table_name="users")
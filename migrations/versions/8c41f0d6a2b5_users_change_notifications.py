@@ -0,0 +1,84 @@
+"""users change notifications
+
+Revision ID: 8c41f0d6a2b5
+Revises: 3b9d2e7c41a8
+Create Date: 2026-10-19 11:02:48.557130
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41f0d6a2b5"
+down_revision: Union[str, None] = "3b9d2e7c41a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_users_change() RETURNS trigger AS $$
+        DECLARE
+            record_id uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                record_id := OLD.id;
+            ELSE
+                record_id := NEW.id;
+            END IF;
+            PERFORM pg_notify(
+                'users_changes',
+                json_build_object('id', record_id, 'op', TG_OP)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_passwords_change() RETURNS trigger AS $$
+        DECLARE
+            record_id uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                record_id := OLD.user_id;
+            ELSE
+                record_id := NEW.user_id;
+            END IF;
+            PERFORM pg_notify(
+                'users_changes',
+                json_build_object('id', record_id, 'op', TG_OP)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_change_notify
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_change();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER passwords_change_notify
+        AFTER INSERT OR UPDATE OR DELETE ON passwords
+        FOR EACH ROW EXECUTE FUNCTION notify_passwords_change();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS passwords_change_notify ON passwords;")
+    op.execute("DROP TRIGGER IF EXISTS users_change_notify ON users;")
+    op.execute("DROP FUNCTION IF EXISTS notify_passwords_change();")
+    op.execute("DROP FUNCTION IF EXISTS notify_users_change();")
@@ -0,0 +1,57 @@
+"""users version
+
+Revision ID: a1c5e9f27b40
+Revises: 6e2f81b0c7d9
+Create Date: 2026-10-19 15:37:54.140263
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c5e9f27b40"
+down_revision: Union[str, None] = "6e2f81b0c7d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_user_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := OLD.version + 1;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    # Версия меняется только вместе с данными, которые видят клиенты
+    op.execute(
+        """
+        CREATE TRIGGER users_version_bump
+        BEFORE UPDATE OF name, email, is_admin, is_disabled ON users
+        FOR EACH ROW
+        WHEN (
+            (OLD.name, OLD.email, OLD.is_admin, OLD.is_disabled)
+            IS DISTINCT FROM (NEW.name, NEW.email, NEW.is_admin, NEW.is_disabled)
+        )
+        EXECUTE FUNCTION bump_user_version();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_version_bump ON users;")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_version();")
+    op.drop_column("users", "version")
@@ -0,0 +1,40 @@
+"""idempotency keys claim token
+
+Revision ID: a9e4b7c2d813
+Revises: f5d2c8e3a916
+Create Date: 2026-10-21 09:41:17.502861
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9e4b7c2d813"
+down_revision: Union[str, None] = "f5d2c8e3a916"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующим записям назначаются случайные токены захвата
+    op.add_column(
+        "idempotency_keys",
+        sa.Column(
+            "token",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("idempotency_keys", "token", server_default=None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("idempotency_keys", "token")
@@ -0,0 +1,67 @@
+"""users login activity
+
+Revision ID: b7e3d19a5c62
+Revises: a1c5e9f27b40
+Create Date: 2026-10-19 17:12:09.481327
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3d19a5c62"
+down_revision: Union[str, None] = "a1c5e9f27b40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "failed_login_attempts", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    # Запись активности входа не должна сбрасывать кэши воркеров,
+    # поэтому об обновлениях уведомляем только при смене версии записи
+    op.execute("DROP TRIGGER IF EXISTS users_change_notify ON users;")
+    op.execute(
+        """
+        CREATE TRIGGER users_change_notify
+        AFTER UPDATE ON users
+        FOR EACH ROW
+        WHEN (OLD.id IS DISTINCT FROM NEW.id OR OLD.version IS DISTINCT FROM NEW.version)
+        EXECUTE FUNCTION notify_users_change();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_delete_notify
+        AFTER DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_change();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_delete_notify ON users;")
+    op.execute("DROP TRIGGER IF EXISTS users_change_notify ON users;")
+    op.execute(
+        """
+        CREATE TRIGGER users_change_notify
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_change();
+        """
+    )
+    op.drop_column("users", "failed_login_attempts")
+    op.drop_column("users", "last_login_at")
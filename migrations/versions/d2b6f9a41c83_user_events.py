@@ -0,0 +1,89 @@
+"""user events
+
+Revision ID: d2b6f9a41c83
+Revises: c4f8a2d61e37
+Create Date: 2026-10-19 21:03:37.215840
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b6f9a41c83"
+down_revision: Union[str, None] = "c4f8a2d61e37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_events",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=False),
+        sa.Column("is_disabled", sa.Boolean(), nullable=False),
+        sa.Column("op", sa.String(length=6), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("user_event_created_at_idx", "user_events", ["created_at"], unique=False)
+    # Событие записывается в той же транзакции, что и изменение пользователя,
+    # а уведомление с ним доставляется слушателям после ее фиксации
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_user_event() RETURNS trigger AS $$
+        DECLARE
+            event user_events%ROWTYPE;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO user_events (user_id, version, is_admin, is_disabled, op)
+                VALUES (OLD.id, OLD.version, OLD.is_admin, OLD.is_disabled, TG_OP)
+                RETURNING * INTO event;
+            ELSE
+                INSERT INTO user_events (user_id, version, is_admin, is_disabled, op)
+                VALUES (NEW.id, NEW.version, NEW.is_admin, NEW.is_disabled, TG_OP)
+                RETURNING * INTO event;
+            END IF;
+            PERFORM pg_notify('user_events', row_to_json(event)::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_event_record
+        AFTER INSERT OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION record_user_event();
+        """
+    )
+    # Как и для кэша, активность входа не порождает событий
+    op.execute(
+        """
+        CREATE TRIGGER users_update_event_record
+        AFTER UPDATE ON users
+        FOR EACH ROW
+        WHEN (OLD.id IS DISTINCT FROM NEW.id OR OLD.version IS DISTINCT FROM NEW.version)
+        EXECUTE FUNCTION record_user_event();
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_update_event_record ON users;")
+    op.execute("DROP TRIGGER IF EXISTS users_event_record ON users;")
+    op.execute("DROP FUNCTION IF EXISTS record_user_event();")
+    op.drop_index("user_event_created_at_idx", table_name="user_events")
+    op.drop_table("user_events")
@@ -0,0 +1,43 @@
+"""redundant indexes cleanup
+
+Revision ID: d5a7c93e18f4
+Revises: 8c41f0d6a2b5
+Create Date: 2026-10-19 12:20:05.918342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a7c93e18f4"
+down_revision: Union[str, None] = "8c41f0d6a2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дублируют B-tree индексы первичных ключей и ограничений уникальности
+    op.drop_index("user_id_idx", table_name="users", postgresql_using="hash")
+    op.drop_index("user_name_idx", table_name="users", postgresql_using="hash")
+    op.drop_index("user_email_idx", table_name="users", postgresql_using="hash")
+    op.drop_index("password_id_idx", table_name="passwords", postgresql_using="hash")
+
+    # Хеш пароля с солью никогда не ищется и уникален сам по себе
+    op.drop_index("password_hash_idx", table_name="passwords", postgresql_using="hash")
+    op.drop_constraint("passwords_hash_key", "passwords", type_="unique")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint("passwords_hash_key", "passwords", ["hash"])
+    op.create_index(
+        "password_hash_idx", "passwords", ["hash"], unique=False, postgresql_using="hash"
+    )
+    op.create_index("password_id_idx", "passwords", ["id"], unique=False, postgresql_using="hash")
+    op.create_index("user_email_idx", "users", ["email"], unique=False, postgresql_using="hash")
+    op.create_index("user_name_idx", "users", ["name"], unique=False, postgresql_using="hash")
+    op.create_index("user_id_idx", "users", ["id"], unique=False, postgresql_using="hash")
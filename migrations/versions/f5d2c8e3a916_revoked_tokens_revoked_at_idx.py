@@ -0,0 +1,30 @@
+"""revoked tokens revoked_at index
+
+Revision ID: f5d2c8e3a916
+Revises: e7c1a4b9d052
+Create Date: 2026-10-20 10:12:44.307519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f5d2c8e3a916"
+down_revision: Union[str, None] = "e7c1a4b9d052"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "revoked_token_revoked_at_idx", "revoked_tokens", ["revoked_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("revoked_token_revoked_at_idx", table_name="revoked_tokens")
@@ -1,5 +1,7 @@
+from .api_keys import router as api_keys_router
 from .auth import router as auth_router
+from .debug import router as debug_router
 from .health import router as health_router
 from .users import router as users_router
 
-__all__ = ("auth_router", "users_router", "health_router")
+__all__ = ("auth_router", "users_router", "health_router", "debug_router", "api_keys_router")
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from sqlalchemy import select
+
+from database import LazySession, get_db
+from database.models import ApiKey
+from schemas.api_keys import ApiKeyResponse, CreateApiKeyRequest, CreateApiKeyResponse
+from service_logging import logger
+from utils.api_keys import api_keys
+
+from .utils.security import require_admin
+from .utils.tracing import TracedRoute
+
+router = APIRouter(
+    prefix="/api-keys",
+    tags=["API keys"],
+    dependencies=[Depends(require_admin)],
+    route_class=TracedRoute,
+)
+
+
+@router.post(
+    path="",
+    summary="Выпуск API ключа сервисного аккаунта",
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_api_key(
+    key_data: CreateApiKeyRequest = Body(...),
+    db: LazySession = Depends(get_db),
+) -> CreateApiKeyResponse:
+    """Выпускает API ключ сервисного аккаунта. Ключ возвращается только
+    в ответе на этот запрос, в базе данных хранится лишь его хеш.
+    """
+    logger.info(f"Issuing an API key for '{key_data.name}'...")
+    record, api_key = await api_keys.issue(db, key_data.name)
+    logger.success(f"API key issued: {record.key_id}")
+
+    return CreateApiKeyResponse(
+        id=record.id,
+        key_id=record.key_id,
+        name=record.name,
+        created_at=record.created_at,
+        revoked_at=record.revoked_at,
+        api_key=api_key,
+    )
+
+
+@router.get(path="", summary="Список API ключей сервисных аккаунтов")
+async def get_api_keys(db: LazySession = Depends(get_db)) -> list[ApiKeyResponse]:
+    """Возвращает все выпущенные API ключи, включая отозванные."""
+    result = await db.scalars(select(ApiKey).order_by(ApiKey.created_at))
+    return [ApiKeyResponse.model_validate(record) for record in result]
+
+
+@router.delete(
+    path="/{key_id}",
+    summary="Отзыв API ключа сервисного аккаунта",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def revoke_api_key(
+    key_id: str = Path(max_length=16, description="Идентификатор API ключа"),
+    db: LazySession = Depends(get_db),
+) -> None:
+    """Отзывает API ключ. Остальные воркеры перестают принимать ключ
+    после очередного обновления реестра ключей.
+    """
+    logger.info(f"Revoking an API key {key_id}...")
+    is_revoked = await api_keys.revoke(db, key_id)
+    if not is_revoked:
+        detail = "API key not found or already revoked."
+        logger.error(detail)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail,
+        )
+
+    logger.success(f"API key has been revoked: {key_id}")
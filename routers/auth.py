@@ -1,10 +1,11 @@
-import bcrypt as bc
-from fastapi import APIRouter, Body, Depends, status
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, status
 from fastapi.exceptions import HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 
-from database import get_db
+from database import LazySession, get_db, get_read_db
 from database.models import Password, User
 from schemas.auth import (
     AuthenticateUserRequest,
@@ -13,17 +14,32 @@ from schemas.auth import (
     AuthorizeUserResponse,
     RegisterUserRequest,
     RegisterUserResponse,
+    RevokeTokenRequest,
 )
 from service_logging import logger
-from utils.auth import decode_access_token, encode_access_token, identificate_user
+from utils.activity import login_activity
+from utils.api_keys import api_keys
+from utils.auth import (
+    AuthorizationError,
+    authorize_access_token,
+    authorize_api_key,
+    encode_access_token,
+    identificate_user,
+    revoke_access_token,
+)
+from utils.idempotency import IdempotencyClaim, StoredResponse, idempotency
+from utils.passwords import check_password, hash_password
+from utils.users import user_exists_stmt
 
-router = APIRouter()
+from .utils.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.post("/login", summary="Аутентификация пользователя")
 async def authenticate_user(
     user_data: AuthenticateUserRequest,
-    db: AsyncSession = Depends(get_db),
+    db: LazySession = Depends(get_db),
 ) -> AuthenticateUserResponse:
     """Аутентифицирует пользователя, возвращает JWT токен авторизации в случае успеха."""
     # Идентификация
@@ -37,11 +53,16 @@ async def authenticate_user(
             detail=detail,
         )
 
+    # Соединение не удерживается на время проверки пароля
+    await db.release()
+
     # Аутентификация
     logger.info("User authentication...")
-    password = await user.awaitable_attrs.password
-    is_valid = bc.checkpw(user_data.password.encode(), password.hash.encode())
+    is_valid = user.password_hash is not None and await check_password(
+        user_data.password, user.password_hash
+    )
     if not is_valid:
+        login_activity.record_failure(user.id)
         detail = "User authentication failed."
         logger.error(detail)
         raise HTTPException(
@@ -49,17 +70,44 @@ async def authenticate_user(
             detail=detail,
         )
 
+    login_activity.record_success(user.id)
     logger.success("Authentication is complete. Issuing a JWT token.")
     access_token = await encode_access_token(subject=user.id)
     return AuthenticateUserResponse(access_token=access_token)
 
 
-@router.post("/register", summary="Регистрация пользователя")
-async def register_user(
-    user_data: RegisterUserRequest = Body(...),
-    db: AsyncSession = Depends(get_db),
+async def _create_user(
+    db: LazySession, user_data: RegisterUserRequest, claim: Optional[IdempotencyClaim] = None
 ) -> RegisterUserResponse:
-    """Регистрирует нового пользователя, создает для него и его пароля записи в базе данных."""
+    """Создает записи нового пользователя и его пароля в базе данных.
+
+    Args:
+        db (LazySession): Асинхронная сессия подключения к базе данных.
+        user_data (RegisterUserRequest): Данные регистрации пользователя.
+        claim (Optional[IdempotencyClaim]): Захват ключа идемпотентности запроса,
+            ответ по которому сохраняется в одной транзакции с пользователем.
+
+    Raises:
+        HTTPException: Пользователь с такими данными уже существует (400).
+
+    Returns:
+        RegisterUserResponse: Зарегистрированный пользователь.
+    """
+    # Повторная регистрация отклоняется до дорогого хеширования пароля
+    detail = "User with this data already created."
+    if await db.scalar(user_exists_stmt(user_data.name, user_data.email)):
+        logger.error(f"Registration failed: {detail}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
+
+    # Соединение не удерживается на время хеширования пароля
+    await db.release()
+
+    logger.info("Creating password...")
+    hash = await hash_password(user_data.password)
+
     # Создание нового пользователя
     logger.info("User registration...")
     new_user = User(name=user_data.name, email=user_data.email)
@@ -68,9 +116,9 @@ async def register_user(
         await db.flush()
         await db.refresh(new_user)
 
-    except Exception as _:
+    except IntegrityError as _:
+        # Пользователь мог быть создан параллельным запросом после проверки
         await db.rollback()
-        detail = "User with this data already created."
         logger.error(f"Registration failed: {detail}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -78,49 +126,119 @@ async def register_user(
         )
 
     # Создание пароля привязанного к пользователю
-    logger.info("Creating password...")
-    hash = bc.hashpw(user_data.password.encode(), bc.gensalt())
-    new_user_password = Password(user=new_user, hash=hash.decode())
+    new_user_password = Password(user=new_user, hash=hash)
     db.add(new_user_password)
-    await db.commit()
 
     item = RegisterUserResponse(id=new_user.id, name=new_user.name)
+    if claim is not None:
+        response = StoredResponse(status.HTTP_200_OK, item.model_dump(mode="json"))
+        await idempotency.complete(db, claim, response)
+
+    await db.commit()
     logger.success(f"User has been successfully registered: {item.id}")
 
     return item
 
 
+@router.post("/register", summary="Регистрация пользователя")
+async def register_user(
+    user_data: RegisterUserRequest = Body(...),
+    idempotency_key: Annotated[
+        Optional[str],
+        Header(min_length=1, max_length=255, description="Ключ идемпотентности запроса"),
+    ] = None,
+    db: LazySession = Depends(get_db),
+) -> RegisterUserResponse:
+    """Регистрирует нового пользователя, создает для него и его пароля записи в базе данных.
+
+    Повтор запроса с тем же заголовком `Idempotency-Key` возвращает ответ
+    на первый запрос, не создавая пользователя заново.
+    """
+    if idempotency_key is None:
+        return await _create_user(db, user_data)
+
+    async def operation(claim: IdempotencyClaim) -> StoredResponse:
+        try:
+            item = await _create_user(db, user_data, claim)
+
+        except HTTPException as error:
+            return StoredResponse(error.status_code, {"detail": error.detail})
+
+        return StoredResponse(status.HTTP_200_OK, item.model_dump(mode="json"))
+
+    fingerprint = idempotency.fingerprint(user_data.model_dump_json())
+    response, is_replayed = await idempotency.execute(
+        "register", idempotency_key, fingerprint, operation
+    )
+    if is_replayed:
+        logger.info(f"Registration replayed by idempotency key: {response.status_code}")
+
+    return JSONResponse(
+        status_code=response.status_code,
+        content=response.body,
+        headers={"Idempotent-Replayed": str(is_replayed).lower()},
+    )
+
+
 @router.post("/verify", summary="Авторизация пользователя")
 async def authorize_user(
     user_data: AuthorizeUserRequest = Body(...),
-    db: AsyncSession = Depends(get_db),
+    db: LazySession = Depends(get_read_db),
 ) -> AuthorizeUserResponse:
-    # Расшифровка JWT токена доступа
-    logger.success("Decoding a JWT token....")
-    user_id = await decode_access_token(access_token=user_data.access_token)
-    print(user_id)
-    if user_id is None:
-        detail = "Access token is invalid."
-        logger.error(detail)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=detail,
+    """Авторизует пользователя по токену доступа или сервисный аккаунт
+    по API ключу, возвращая данные о нем.
+    """
+    if api_keys.is_api_key(user_data.access_token):
+        logger.info("Authorizing a service account by an API key...")
+        try:
+            account = authorize_api_key(user_data.access_token)
+
+        except AuthorizationError as error:
+            logger.error(error.detail)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=error.detail,
+            )
+
+        item = AuthorizeUserResponse(
+            id=account.id, name=account.name, is_admin=False, is_service_account=True
         )
+        logger.success(f"Service account authorized: {item.id}")
 
-    # Получение данных о пользователе
-    logger.info("Getting information about an user...")
-    stmt = select(User).where((User.id == user_id) & (~User.is_disabled))
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    if user is None:
-        detail = "User account is disabled or does not exist."
-        logger.error(detail)
+        return item
+
+    logger.info("Authorizing an user by a JWT token...")
+    try:
+        user = await authorize_access_token(db, user_data.access_token)
+
+    except AuthorizationError as error:
+        logger.error(error.detail)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=detail,
+            detail=error.detail,
         )
 
     item = AuthorizeUserResponse(id=user.id, name=user.name, is_admin=user.is_admin)
     logger.success(f"User authorized: {item.id}")
 
     return item
+
+
+@router.post(
+    "/revoke",
+    summary="Отзыв токена доступа",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def revoke_token(token_data: RevokeTokenRequest = Body(...)) -> None:
+    """Отзывает токен доступа до истечения срока его действия."""
+    logger.info("Revoking a JWT token...")
+    is_revoked = await revoke_access_token(access_token=token_data.access_token)
+    if not is_revoked:
+        detail = "Access token is invalid."
+        logger.error(detail)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=detail,
+        )
+
+    logger.success("Access token has been revoked.")
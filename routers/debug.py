@@ -0,0 +1,94 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import JSONResponse
+
+from service_logging import logger
+from utils.memory import cache_report, memory_profiler, process_memory
+
+from .utils.security import require_admin
+from .utils.tracing import TracedRoute
+
+router = APIRouter(
+    prefix="/debug/memory",
+    tags=["Debug"],
+    dependencies=[Depends(require_admin)],
+    route_class=TracedRoute,
+)
+
+
+@router.get(path="", summary="Состояние памяти процесса")
+async def memory_status() -> JSONResponse:
+    """Возвращает сведения о памяти воркера, состояние профилировщика
+    и размеры кэшей сервиса в памяти.
+    """
+    return JSONResponse(
+        content={
+            "process": process_memory(),
+            "profiler": memory_profiler.status(),
+            "caches": cache_report(),
+        }
+    )
+
+
+@router.post(path="/start", summary="Запуск профилирования памяти")
+async def start_profiling(
+    frames: Annotated[int, Query(ge=1, le=64, description="Глубина стека выделения")] = 1,
+) -> JSONResponse:
+    """Запускает отслеживание выделений памяти в текущем воркере."""
+    memory_profiler.start(frames)
+    logger.warning("Memory profiling started.")
+    return JSONResponse(content=memory_profiler.status())
+
+
+@router.post(path="/stop", summary="Остановка профилирования памяти")
+async def stop_profiling() -> JSONResponse:
+    """Останавливает отслеживание выделений памяти и удаляет снимки."""
+    memory_profiler.stop()
+    logger.warning("Memory profiling stopped.")
+    return JSONResponse(content=memory_profiler.status())
+
+
+@router.post(path="/snapshots", summary="Снимок выделений памяти")
+async def take_snapshot() -> JSONResponse:
+    """Снимает снимок выделений памяти, возвращая его идентификатор."""
+    try:
+        # Снятие снимка занимает заметное время, поэтому выполняется вне цикла событий
+        snapshot_id = await asyncio.to_thread(memory_profiler.take_snapshot)
+
+    except RuntimeError as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error))
+
+    return JSONResponse(content={"id": snapshot_id})
+
+
+@router.get(path="/snapshots/{snapshot_id}", summary="Крупнейшие выделения памяти")
+async def snapshot_top(
+    snapshot_id: Annotated[int, Path(...)],
+    limit: Annotated[int, Query(ge=1, le=500)] = 20,
+) -> JSONResponse:
+    """Возвращает модули, удерживающие больше всего памяти в снимке."""
+    try:
+        items = await asyncio.to_thread(memory_profiler.top, snapshot_id, limit)
+
+    except LookupError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error))
+
+    return JSONResponse(content={"id": snapshot_id, "items": items})
+
+
+@router.get(path="/diff", summary="Разница снимков памяти")
+async def snapshots_diff(
+    from_id: Annotated[int, Query(...)],
+    to_id: Annotated[int, Query(...)],
+    limit: Annotated[int, Query(ge=1, le=500)] = 20,
+) -> JSONResponse:
+    """Возвращает модули с наибольшим изменением удерживаемой памяти между снимками."""
+    try:
+        items = await asyncio.to_thread(memory_profiler.diff, from_id, to_id, limit)
+
+    except LookupError as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error))
+
+    return JSONResponse(content={"from_id": from_id, "to_id": to_id, "items": items})
@@ -6,8 +6,11 @@ from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import JSONResponse
 
 from service_logging import logger
+from service_metrics import metrics
 
-router = APIRouter(prefix="/health")
+from .utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/health", route_class=TracedRoute)
 
 
 @router.get(path="", summary="Проверка состояния", tags=["Health"])
@@ -34,3 +37,9 @@ async def health_check() -> JSONResponse:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Health check failed: {str(error)}",
         )
+
+
+@router.get(path="/metrics", summary="Метрики сервиса", tags=["Health"])
+async def metrics_snapshot() -> JSONResponse:
+    """Возвращает текущие значения метрик сервиса."""
+    return JSONResponse(content=metrics.snapshot())
@@ -1,35 +1,76 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from database import get_db
-from database.models import User
-from schemas.users import UserResponse
+from database import LazySession, get_read_db
+from schemas.users import UserResponse, UsersLookupRequest, UsersLookupResponse
 from service_logging import logger
+from utils.users import (
+    fetch_user,
+    fetch_users,
+    users_count_stmt,
+    users_page_stmt,
+    users_search_criteria,
+    users_versions_stmt,
+)
 
+from .utils.conditional import is_not_modified, make_etag, not_modified, set_cache_headers
+from .utils.events import user_events_stream
+from .utils.filters import UsersFilter
 from .utils.pagination import PaginatedResponse, Pagination
+from .utils.security import require_service
+from .utils.tracing import TracedRoute
 
-router = APIRouter(prefix="/users")
+router = APIRouter(prefix="/users", route_class=TracedRoute)
 
 
 @router.get("/", summary="Получить всех пользователей")
 async def get_users(
+    request: Request,
+    response: Response,
     pg: Annotated[Pagination, Depends()],
-    db: AsyncSession = Depends(get_db),
+    filters: Annotated[UsersFilter, Depends()],
+    db: LazySession = Depends(get_read_db),
 ) -> PaginatedResponse[UserResponse]:
-    """Постранично возвращает список всех зарегистрированных пользователей."""
+    """Постранично возвращает список зарегистрированных пользователей,
+    удовлетворяющих условиям поиска и фильтрации.
+    Поддерживает условный запрос по заголовку `If-None-Match`.
+    """
     logger.info("Getting the user list...")
-    stmt = select(User).offset(pg.skip).limit(pg.size)
-    result = await db.execute(stmt)
-    users = result.scalars().all()
+    criteria = users_search_criteria(filters.q, filters.is_admin, filters.is_disabled)
 
-    stmt = select(func.count()).select_from(User)
+    stmt = users_count_stmt(*criteria)
     result = await db.execute(stmt)
     total = result.scalar_one()
 
+    # Неизменность страницы проверяется по версиям записей без их загрузки
+    if "if-none-match" in request.headers:
+        stmt = users_versions_stmt(pg.skip, pg.size, *criteria)
+        result = await db.execute(stmt)
+        etag = make_etag(filters, pg.page, pg.size, total, [tuple(row) for row in result])
+        if is_not_modified(request, etag):
+            logger.success("User list not modified.")
+            return not_modified(etag)
+
+    stmt = users_page_stmt(pg.skip, pg.size, *criteria)
+    result = await db.execute(stmt)
+    users = result.scalars().all()
+
+    etag = make_etag(filters, pg.page, pg.size, total, [(user.id, user.version) for user in users])
+    set_cache_headers(response, etag)
+
     items = [UserResponse.model_validate(user) for user in users]
     logger.success(f"Received {len(items)} users.")
 
@@ -41,16 +82,60 @@ async def get_users(
     )
 
 
+@router.post("/lookup", summary="Пакетный поиск пользователей")
+async def lookup_users(
+    lookup_data: UsersLookupRequest = Body(...),
+    db: LazySession = Depends(get_read_db),
+) -> UsersLookupResponse:
+    """Возвращает информацию о пользователях по списку UUID за один запрос,
+    явно перечисляя ненайденные идентификаторы.
+    """
+    logger.info(f"Looking up {len(lookup_data.ids)} users...")
+    users = await fetch_users(db, lookup_data.ids)
+    missing = [user_id for user_id in dict.fromkeys(lookup_data.ids) if user_id not in users]
+
+    logger.success(f"Found {len(users)} users, {len(missing)} missing.")
+    return UsersLookupResponse(
+        users={user_id: UserResponse.model_validate(user) for user_id, user in users.items()},
+        missing=missing,
+    )
+
+
+@router.get(
+    "/events",
+    summary="Поток изменений пользователей",
+    dependencies=[Depends(require_service)],
+    response_class=StreamingResponse,
+)
+async def stream_users_events(
+    last_event_id: Annotated[
+        Optional[int], Header(ge=0, description="Смещение последнего полученного события")
+    ] = None,
+) -> StreamingResponse:
+    """Возвращает поток server-sent events об изменении пользователей
+    (версия, флаги админ прав и блокировки) для сброса кэшей на стороне
+    клиентов. Поток продолжается с `Last-Event-ID` при переподключении.
+    """
+    logger.info(f"Streaming users events after {last_event_id}...")
+    return StreamingResponse(
+        user_events_stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{uuid}")
 async def get_user(
+    request: Request,
+    response: Response,
     uuid: Annotated[UUID, Path(...)],
-    db: AsyncSession = Depends(get_db),
+    db: LazySession = Depends(get_read_db),
 ) -> UserResponse:
-    """Возвращает информацию о конкретном зарегистрированном пользователе по его UUID."""
+    """Возвращает информацию о конкретном зарегистрированном пользователе по его UUID.
+    Поддерживает условный запрос по заголовку `If-None-Match`.
+    """
     logger.info("Getting information about an user...")
-    stmt = select(User).where(User.id == uuid)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await fetch_user(db, uuid)
 
     if user is None:
         detail = "User not found."
@@ -59,6 +144,13 @@ async def get_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=detail,
         )
+
+    etag = make_etag(user.id, user.version)
+    if is_not_modified(request, etag):
+        logger.success(f"User not modified: {user.id}")
+        return not_modified(etag)
+
+    set_cache_headers(response, etag)
     item = UserResponse.model_validate(user)
     logger.success(f"Text received: {item.id}")
 
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Формирует сильный ETag из составляющих представления ресурса.
+
+    Args:
+        *parts (Any): Значения, от которых зависит представление.
+
+    Returns:
+        str: Значение заголовка ETag.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Проверяет, совпадает ли ETag с одним из переданных в `If-None-Match`.
+    Для `If-None-Match` используется слабое сравнение (RFC 9110).
+
+    Args:
+        request (Request): Входящий запрос.
+        etag (str): Текущий ETag ресурса.
+
+    Returns:
+        bool: Флаг неизменности ресурса.
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    candidates = (candidate.strip().removeprefix("W/") for candidate in header.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """Устанавливает заголовки условного кэширования ответа.
+
+    Args:
+        response (Response): Ответ.
+        etag (str): ETag ресурса.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Формирует ответ `304 Not Modified`.
+
+    Args:
+        etag (str): ETag ресурса.
+
+    Returns:
+        Response: Ответ без тела.
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag)
+    return response
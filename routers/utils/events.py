@@ -0,0 +1,84 @@
+import json
+from typing import AsyncIterator, Optional
+
+from configs import configs
+from utils.user_events import user_events
+
+
+def format_event(
+    data: Optional[dict] = None, event: Optional[str] = None, event_id: Optional[int] = None
+) -> str:
+    """Формирует сообщение потока server-sent events.
+
+    Args:
+        data (Optional[dict]): Данные сообщения.
+        event (Optional[str]): Тип сообщения.
+        event_id (Optional[int]): Идентификатор сообщения, с которого клиент
+            продолжит поток при переподключении (`Last-Event-ID`).
+
+    Returns:
+        str: Сообщение потока.
+    """
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data or {})}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def user_events_stream(last_event_id: Optional[int]) -> AsyncIterator[str]:
+    """Поток событий изменения пользователей.
+
+    Без `last_event_id` поток начинается с сообщения `ready` со смещением
+    текущего события. Иначе сначала повторяются события журнала после
+    `last_event_id` (с запасом на транзакции, зафиксированные не по порядку
+    смещений), а затем отправляется `ready`. Если повтор неполон, вместо
+    него отправляется `resync`: клиент должен сбросить свой кэш. Далее
+    передаются живые события, а при их отсутствии - комментарии для
+    поддержания соединения.
+
+    Идентификатором сообщения служит наибольшее переданное смещение, так как
+    события могут приходить не по порядку смещений.
+
+    Args:
+        last_event_id (Optional[int]): Идентификатор последнего полученного клиентом сообщения.
+
+    Yields:
+        str: Сообщения потока.
+    """
+    # Подписка открывается до повтора, чтобы не потерять события между ними
+    async with user_events.subscribe() as subscription:
+        replayed = set()
+        if last_event_id is None:
+            cursor = user_events.head
+            yield format_event(event="ready", event_id=cursor)
+        else:
+            replay = await user_events.replay(last_event_id)
+            if replay.is_complete:
+                cursor = last_event_id
+                for event in replay.events:
+                    replayed.add(event.offset)
+                    cursor = max(cursor, event.offset)
+                    yield format_event(event.to_dict(), event="user", event_id=cursor)
+                yield format_event(event="ready")
+            else:
+                cursor = user_events.head
+                yield format_event(event="resync", event_id=cursor)
+
+        while True:
+            try:
+                event = await subscription.get(configs.user_events.HEARTBEAT_INTERVAL)
+
+            except TimeoutError:
+                yield ": ping\n\n"
+                continue
+
+            # Очередь подписки переполнена, клиент продолжит поток после переподключения
+            if event is None:
+                return
+
+            if event.offset not in replayed:
+                cursor = max(cursor, event.offset)
+                yield format_event(event.to_dict(), event="user", event_id=cursor)
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class UsersFilter(BaseModel):
+    """Класс Query параметров, необходимых для поиска и фильтрации пользователей."""
+
+    q: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=255,
+        description="Поиск по имени или электронной почте. "
+        "Короткие запросы (до 3 символов) ищутся по префиксу, остальные по подстроке",
+    )
+    is_admin: Optional[bool] = Field(default=None, description="Флаг админ прав")
+    is_disabled: Optional[bool] = Field(default=None, description="Флаг блокировки")
@@ -0,0 +1,77 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from database import LazySession, get_read_db
+from service_logging import logger
+from utils.api_keys import api_keys
+from utils.auth import AuthorizationError, authorize_access_token, authorize_api_key
+from utils.cache import UserSnapshot
+
+bearer_scheme = HTTPBearer()
+
+
+async def require_admin(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: LazySession = Depends(get_read_db),
+) -> UserSnapshot:
+    """Зависимость, допускающая к маршруту только администраторов
+    по токену доступа из заголовка `Authorization: Bearer`.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials): Токен доступа из заголовка.
+        db (LazySession): Асинхронная сессия подключения к базе данных.
+
+    Raises:
+        HTTPException: Токен не действителен (401) или пользователь не администратор (403).
+
+    Returns:
+        UserSnapshot: Снимок авторизованного администратора.
+    """
+    try:
+        user = await authorize_access_token(db, credentials.credentials)
+
+    except AuthorizationError as error:
+        logger.error(error.detail)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=error.detail,
+        )
+
+    if not user.is_admin:
+        detail = "Administrator rights are required."
+        logger.error(detail)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail,
+        )
+
+    return user
+
+
+async def require_service(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: LazySession = Depends(get_read_db),
+) -> None:
+    """Зависимость, допускающая к маршруту сервисные аккаунты по API ключу
+    и администраторов по токену доступа из заголовка `Authorization: Bearer`.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials): API ключ или токен доступа из заголовка.
+        db (LazySession): Асинхронная сессия подключения к базе данных.
+
+    Raises:
+        HTTPException: Ключ или токен не действителен (401) или пользователь не администратор (403).
+    """
+    if not api_keys.is_api_key(credentials.credentials):
+        await require_admin(credentials, db)
+        return
+
+    try:
+        authorize_api_key(credentials.credentials)
+
+    except AuthorizationError as error:
+        logger.error(error.detail)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=error.detail,
+        )
@@ -0,0 +1,39 @@
+import asyncio
+import functools
+import time
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from service_tracing import tracer
+
+
+class TracedRoute(APIRoute):
+    """Маршрут, обработка которого разбивается в трассе запроса на отрезки
+    разрешения зависимостей, выполнения обработчика и формирования ответа.
+    """
+
+    def get_route_handler(self) -> Callable:
+        endpoint = self.dependant.call
+        if asyncio.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def traced_endpoint(*args, **kwargs):
+                # Зависимости разрешаются от начала обработки до вызова обработчика
+                route_span = tracer.current_span()
+                if route_span is not None and route_span.name == "route":
+                    tracer.record_span("dependencies", route_span.start, time.perf_counter_ns())
+
+                with tracer.span("endpoint", function=endpoint.__name__):
+                    return await endpoint(*args, **kwargs)
+
+            self.dependant.call = traced_endpoint
+
+        handler = super().get_route_handler()
+
+        async def traced_handler(request: Request) -> Response:
+            with tracer.span("route", path=self.path):
+                return await handler(request)
+
+        return traced_handler
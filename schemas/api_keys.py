@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CreateApiKeyRequest(BaseModel):
+    """Схема запроса выпуска API ключа сервисного аккаунта."""
+
+    name: str = Field(min_length=1, max_length=255, description="Имя сервисного аккаунта")
+
+
+class ApiKeyResponse(BaseModel):
+    """Схема API ключа сервисного аккаунта без самого ключа."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID = Field(description="Идентификатор сервисного аккаунта")
+    key_id: str = Field(description="Идентификатор API ключа")
+    name: str = Field(max_length=255, description="Имя сервисного аккаунта")
+    created_at: datetime = Field(description="Время выпуска ключа")
+    revoked_at: Optional[datetime] = Field(default=None, description="Время отзыва ключа")
+
+
+class CreateApiKeyResponse(ApiKeyResponse):
+    """Схема ответа выпуска API ключа. Ключ возвращается только один раз."""
+
+    api_key: str = Field(description="API ключ сервисного аккаунта")
@@ -98,7 +98,10 @@ class RegisterUserResponse(BaseModel):
 class AuthorizeUserRequest(BaseModel):
     """Схема запроса авторизации пользователя."""
 
-    access_token: str = Field(description="JWT токен доступа", examples=JWT_TOKEN_TYPE_EXAMPLES)
+    access_token: str = Field(
+        description="JWT токен доступа или API ключ сервисного аккаунта",
+        examples=JWT_TOKEN_TYPE_EXAMPLES,
+    )
 
 
 class AuthorizeUserResponse(BaseModel):
@@ -107,3 +110,12 @@ class AuthorizeUserResponse(BaseModel):
     id: UUID = Field(description="Идентификатор пользователя", examples=ID_EXAMPLES)
     name: str = Field(description="Имя пользователя", max_length=255, examples=NAME_EXAMPLES)
     is_admin: bool = Field(description="Флаг админ прав", examples=FLAG_EXAMPLES)
+    is_service_account: bool = Field(
+        description="Флаг сервисного аккаунта", default=False, examples=FLAG_EXAMPLES
+    )
+
+
+class RevokeTokenRequest(BaseModel):
+    """Схема запроса отзыва токена доступа."""
+
+    access_token: str = Field(description="JWT токен доступа", examples=JWT_ACCESS_TOKEN_EXAMPLES)
@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from configs import configs
+
 
 class UserResponse(BaseModel):
     """Схема валидации зарегистрированного пользователя."""
@@ -33,3 +35,20 @@ class UserResponse(BaseModel):
             raise ValueError("Invalid email format")
 
         return value
+
+
+class UsersLookupRequest(BaseModel):
+    """Схема валидации запроса пакетного поиска пользователей."""
+
+    ids: list[UUID] = Field(
+        min_length=1,
+        max_length=configs.users.LOOKUP_MAX_IDS,
+        description="Идентификаторы пользователей",
+    )
+
+
+class UsersLookupResponse(BaseModel):
+    """Схема валидации результата пакетного поиска пользователей."""
+
+    users: dict[UUID, UserResponse] = Field(description="Найденные пользователи по идентификаторам")
+    missing: list[UUID] = Field(description="Идентификаторы ненайденных пользователей")
@@ -0,0 +1,5 @@
+from .registry import MetricsRegistry
+
+metrics = MetricsRegistry()
+
+__all__ = ("metrics",)
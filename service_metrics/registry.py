@@ -0,0 +1,135 @@
+import bisect
+from typing import Callable, Optional, Sequence
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Монотонно возрастающий счетчик."""
+
+    def __init__(self, description: str):
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """Увеличивает значение счетчика.
+
+        Args:
+            amount (int): Величина увеличения.
+        """
+        self.value += amount
+
+    def snapshot(self) -> dict:
+        return {"type": "counter", "description": self.description, "value": self.value}
+
+
+class Gauge:
+    """Произвольно изменяемое значение. Может вычисляться функцией при снятии снимка."""
+
+    def __init__(self, description: str, callback: Optional[Callable[[], float]] = None):
+        self.description = description
+        self.value: float = 0
+        self._callback = callback
+
+    def set(self, value: float) -> None:
+        """Устанавливает значение.
+
+        Args:
+            value (float): Новое значение.
+        """
+        self.value = value
+
+    def snapshot(self) -> dict:
+        value = self._callback() if self._callback is not None else self.value
+        return {"type": "gauge", "description": self.description, "value": value}
+
+
+class Histogram:
+    """Гистограмма распределения наблюдаемых значений по корзинам."""
+
+    def __init__(self, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение.
+
+        Args:
+            value (float): Наблюдаемое значение.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        # Накопительные значения корзин, как в формате Prometheus
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+
+        return {
+            "type": "histogram",
+            "description": self.description,
+            "buckets": buckets,
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса. Повторная регистрация метрики
+    с тем же именем возвращает уже существующую метрику.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Регистрирует счетчик.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+
+        Returns:
+            Counter: Счетчик.
+        """
+        return self._metrics.setdefault(name, Counter(description))
+
+    def gauge(
+        self, name: str, description: str, callback: Optional[Callable[[], float]] = None
+    ) -> Gauge:
+        """Регистрирует измеритель.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+            callback (Optional[Callable[[], float]]): Функция вычисления значения.
+
+        Returns:
+            Gauge: Измеритель.
+        """
+        return self._metrics.setdefault(name, Gauge(description, callback))
+
+    def histogram(
+        self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Регистрирует гистограмму.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+            buckets (Sequence[float]): Верхние границы корзин.
+
+        Returns:
+            Histogram: Гистограмма.
+        """
+        return self._metrics.setdefault(name, Histogram(description, buckets))
+
+    def snapshot(self) -> dict[str, dict]:
+        """Возвращает текущие значения всех метрик."""
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
@@ -0,0 +1,5 @@
+from .setup import setup_tracer
+
+tracer = setup_tracer()
+
+__all__ = ("tracer",)
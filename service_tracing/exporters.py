@@ -0,0 +1,175 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Optional
+
+import loguru
+
+from service_metrics.registry import Counter
+
+from .tracer import Span, Trace
+
+
+class SlowTraceLogger:
+    """Экспортер, логирующий дерево отрезков трасс, длительность
+    которых превышает порог.
+    """
+
+    def __init__(self, logger: "loguru.Logger", threshold: float):
+        self.logger = logger
+        self.threshold = threshold
+
+    def export(self, trace: Trace) -> None:
+        if trace.root.duration < self.threshold:
+            return
+
+        children: dict[str, list[Span]] = {}
+        for span in sorted(trace.spans, key=lambda span: span.start):
+            children.setdefault(span.parent_id, []).append(span)
+
+        lines = []
+
+        def render(span: Span, depth: int) -> None:
+            offset = (span.start - trace.root.start) / 1e6
+            attributes = " ".join(f"{key}={value!r}" for key, value in span.attributes.items())
+            error = f" error={span.error}" if span.error else ""
+            lines.append(
+                f"{'  ' * depth}+{offset:.1f}ms {span.duration * 1000:.1f}ms "
+                f"{span.name} {attributes}{error}".rstrip()
+            )
+            for child in children.get(span.span_id, []):
+                render(child, depth + 1)
+
+        render(trace.root, 0)
+        if trace.dropped:
+            lines.append(f"... {trace.dropped} spans dropped")
+
+        self.logger.warning(
+            f"Slow request {trace.root.duration:.3f}s, trace {trace.trace_id}:\n" + "\n".join(lines)
+        )
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class OtlpFileExporter:
+    """Экспортер, дописывающий трассы в файл в формате OTLP/JSON,
+    по одному запросу `ExportTraceServiceRequest` на строку.
+
+    Запись выполняется в отдельном потоке, чтобы не блокировать цикл событий.
+    Если поток не успевает, трассы сверх `max_queue` отбрасываются. Отрезки
+    отброшенных и не записанных из-за ошибки трасс учитываются в `dropped`,
+    а ошибки записи логируются не чаще раза в `error_log_interval` секунд.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str,
+        logger: "loguru.Logger",
+        dropped: Counter,
+        max_queue: int = 10_000,
+        error_log_interval: float = 60.0,
+    ):
+        self.path = path
+        self.service_name = service_name
+        self.logger = logger
+        self.dropped = dropped
+        self.error_log_interval = error_log_interval
+        self._last_error_log: Optional[float] = None
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._write_loop, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(self._to_otlp(trace))
+        except queue.Full:
+            self.dropped.inc(1 + len(trace.spans))
+
+    def _to_otlp(self, trace: Trace) -> dict:
+        # Идентификатор трассы OTLP - 16 байт в hex, хеш запроса дополняется нулями
+        trace_id = trace.trace_id.rjust(32, "0")[-32:]
+
+        def convert(span: Span) -> dict:
+            start = trace.wall_start + span.start - trace.root.start
+            end = trace.wall_start + (span.end or span.start) - trace.root.start
+            item = {
+                "traceId": trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 2 if span is trace.root else 1,
+                "startTimeUnixNano": str(start),
+                "endTimeUnixNano": str(end),
+                "attributes": _otlp_attributes(span.attributes),
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+            }
+            if span.parent_id is not None:
+                item["parentSpanId"] = span.parent_id
+
+            return item
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": self.service_name}),
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "service_tracing"},
+                            "spans": [convert(trace.root), *map(convert, trace.spans)],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _write_loop(self) -> None:
+        while True:
+            # Дописываем все накопившиеся трассы за одно открытие файла
+            items = [self._queue.get()]
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            try:
+                lines = [json.dumps(item, separators=(",", ":")) + "\n" for item in items]
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.writelines(lines)
+
+            except Exception as error:
+                spans_count = sum(
+                    len(scope["spans"])
+                    for item in items
+                    for resource in item["resourceSpans"]
+                    for scope in resource["scopeSpans"]
+                )
+                self.dropped.inc(spans_count)
+                self._log_error(error)
+
+    def _log_error(self, error: Exception) -> None:
+        now_time = time.monotonic()
+        if (
+            self._last_error_log is not None
+            and now_time - self._last_error_log < self.error_log_interval
+        ):
+            return
+
+        self._last_error_log = now_time
+        self.logger.error(
+            f"OTLP trace export to {self.path} failed, "
+            f"{self.dropped.value} spans dropped in total: {error!r}"
+        )
@@ -0,0 +1,30 @@
+from configs import configs
+from service_logging import logger
+from service_metrics import metrics
+
+from .exporters import OtlpFileExporter, SlowTraceLogger
+from .tracer import Tracer
+
+
+def setup_tracer() -> Tracer:
+    """Функция инициализации трассировщика.
+
+    Трассы медленных запросов логируются деревом отрезков. Дополнительно,
+    если в конфигурации проекта задана переменная TRACING_OTLP_FILE_PATH,
+    все трассы дописываются в файл в формате OTLP/JSON.
+    """
+    exporters = [SlowTraceLogger(logger, configs.tracing.SLOW_REQUEST_THRESHOLD)]
+
+    if configs.tracing.OTLP_FILE_PATH:
+        dropped = metrics.counter(
+            "tracing_spans_dropped_total", "Отрезки трасс, не записанные в файл OTLP."
+        )
+        exporters.append(
+            OtlpFileExporter(configs.tracing.OTLP_FILE_PATH, configs.SERVICE_NAME, logger, dropped)
+        )
+
+    return Tracer(
+        is_enabled=configs.tracing.ENABLE,
+        max_spans=configs.tracing.MAX_SPANS,
+        exporters=exporters,
+    )
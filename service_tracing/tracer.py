@@ -0,0 +1,206 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Protocol
+
+
+@dataclass(slots=True)
+class Span:
+    """Отрезок времени выполнения именованной операции в рамках трассы."""
+
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: int
+    end: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Длительность операции в секундах."""
+        if self.end is None:
+            return 0.0
+
+        return (self.end - self.start) / 1e9
+
+
+@dataclass(slots=True)
+class Trace:
+    """Трасса обработки одного запроса. Время отрезков отсчитывается
+    по `time.perf_counter_ns()`, а `wall_start` связывает его с реальным временем.
+    """
+
+    trace_id: str
+    root: Span
+    wall_start: int
+    spans: list[Span] = field(default_factory=list)
+    dropped: int = 0
+
+
+class TraceExporter(Protocol):
+    """Получатель завершенных трасс."""
+
+    def export(self, trace: Trace) -> None: ...
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class Tracer:
+    """Внутрипроцессный трассировщик.
+
+    Трасса открывается на время обработки запроса, а отрезки операций
+    внутри нее связываются в дерево через переменные контекста. Вне
+    трассы отрезки не создаются, поэтому фоновые задачи не несут
+    накладных расходов. Завершенные трассы передаются экспортерам.
+    """
+
+    def __init__(
+        self,
+        is_enabled: bool = True,
+        max_spans: int = 512,
+        exporters: Optional[list[TraceExporter]] = None,
+    ):
+        self.is_enabled = is_enabled
+        self.max_spans = max_spans
+        self.exporters = exporters or []
+
+    @contextmanager
+    def trace(self, trace_id: str, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Открывает трассу на время контекста.
+
+        Args:
+            trace_id (str): Идентификатор трассы.
+            name (str): Имя корневого отрезка.
+            **attributes (Any): Атрибуты корневого отрезка.
+
+        Yields:
+            Optional[Span]: Корневой отрезок или `None`, если трассировка отключена.
+        """
+        if not self.is_enabled:
+            yield None
+            return
+
+        root = Span(name, _new_span_id(), None, time.perf_counter_ns(), attributes=attributes)
+        trace = Trace(trace_id, root, time.time_ns())
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+        try:
+            yield root
+
+        except BaseException as error:
+            root.error = repr(error)
+            raise
+
+        finally:
+            root.end = time.perf_counter_ns()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            self._export(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Открывает дочерний отрезок текущего отрезка на время контекста.
+
+        Args:
+            name (str): Имя отрезка.
+            **attributes (Any): Атрибуты отрезка.
+
+        Yields:
+            Optional[Span]: Отрезок или `None`, если трасса не открыта.
+        """
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+
+        except BaseException as error:
+            span.error = repr(error)
+            raise
+
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def current_span(self) -> Optional[Span]:
+        """Возвращает текущий отрезок открытой трассы."""
+        return _current_span.get()
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """Создает дочерний отрезок текущего отрезка, не делая его текущим.
+        Подходит для операций, начало и конец которых приходят разными событиями.
+
+        Args:
+            name (str): Имя отрезка.
+            **attributes (Any): Атрибуты отрезка.
+
+        Returns:
+            Optional[Span]: Отрезок или `None`, если трасса не открыта или переполнена.
+        """
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+
+        if len(trace.spans) >= self.max_spans:
+            trace.dropped += 1
+            return None
+
+        parent = _current_span.get()
+        span = Span(
+            name,
+            _new_span_id(),
+            parent.span_id if parent is not None else trace.root.span_id,
+            time.perf_counter_ns(),
+            attributes=attributes,
+        )
+        trace.spans.append(span)
+        return span
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        """Завершает отрезок, созданный `start_span()`. Повторное
+        завершение отрезка не меняет время его окончания.
+
+        Args:
+            span (Optional[Span]): Отрезок.
+            error (Optional[BaseException]): Ошибка, которой завершилась операция.
+        """
+        if span is None or span.end is not None:
+            return
+
+        span.end = time.perf_counter_ns()
+        if error is not None:
+            span.error = repr(error)
+
+    def record_span(self, name: str, start: int, end: int, **attributes: Any) -> None:
+        """Добавляет уже завершившийся отрезок текущего отрезка.
+
+        Args:
+            name (str): Имя отрезка.
+            start (int): Начало по `time.perf_counter_ns()`.
+            end (int): Конец по `time.perf_counter_ns()`.
+            **attributes (Any): Атрибуты отрезка.
+        """
+        span = self.start_span(name, **attributes)
+        if span is not None:
+            span.start, span.end = start, end
+
+    def _export(self, trace: Trace) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+
+            except Exception:
+                # Ошибка экспорта не должна влиять на обработку запроса
+                pass
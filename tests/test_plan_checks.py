@@ -0,0 +1,27 @@
+import asyncio
+import warnings
+
+import asyncpg
+import pytest
+from pydantic import ValidationError
+
+
+def test_hot_queries_use_expected_indexes():
+    """Горячие запросы не должны переходить на последовательное сканирование
+    или неожиданные индексы на объеме данных, близком к рабочему.
+    """
+    try:
+        # Конфигурация читается при импорте и требует переменных окружения БД
+        from database.plan_checks import collect_regressions
+
+        regressions = asyncio.run(collect_regressions())
+
+    except (OSError, ValidationError, asyncpg.PostgresError) as error:
+        pytest.skip(f"PostgreSQL is unavailable: {error!r}")
+
+    skipped = [name for name, found in regressions.items() if found is None]
+    if skipped:
+        warnings.warn(f"Plan checks skipped, required extension is missing: {skipped}")
+
+    failed = {name: found for name, found in regressions.items() if found}
+    assert not failed, f"Plan regressions: {failed}"
@@ -0,0 +1,4 @@
+from .client import InternalVerifyClient
+from .server import internal_server
+
+__all__ = ("InternalVerifyClient", "internal_server")
@@ -0,0 +1,126 @@
+import asyncio
+import itertools
+from contextlib import suppress
+from typing import Optional
+
+from .protocol import (
+    FRAME_HEADER,
+    Opcode,
+    ProtocolError,
+    VerifyResult,
+    decode_response,
+    encode_request,
+)
+
+
+class InternalVerifyClient:
+    """Клиент внутреннего протокола авторизации.
+
+    Поддерживает конвейерную отправку запросов по одному соединению:
+    каждый вызов `verify` ожидает свой ответ по идентификатору запроса.
+    После разрыва соединения клиент непригоден, и нужно подключиться заново.
+    """
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float = 5.0
+    ):
+        self._reader = reader
+        self._writer = writer
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._closed_reason = "Connection closed."
+        self._reader_task = asyncio.create_task(self._read_responses())
+
+    @property
+    def is_closed(self) -> bool:
+        """Флаг разрыва соединения с сервером."""
+        return self._reader_task.done()
+
+    @classmethod
+    async def connect(
+        cls,
+        socket_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 8063,
+        timeout: float = 5.0,
+    ) -> "InternalVerifyClient":
+        """Подключается к внутреннему серверу авторизации.
+
+        Args:
+            socket_path (Optional[str]): Путь к Unix сокету. Если не задан, используется TCP.
+            host (str): Адрес TCP сервера.
+            port (int): Порт TCP сервера.
+            timeout (float): Время ожидания ответа на запрос в секундах.
+
+        Returns:
+            InternalVerifyClient: Подключенный клиент.
+        """
+        if socket_path:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+
+        return cls(reader, writer, timeout)
+
+    async def verify(self, access_token: str) -> VerifyResult:
+        """Авторизует пользователя по токену доступа.
+
+        Args:
+            access_token (str): JWT Токен доступа.
+
+        Raises:
+            ConnectionError: Соединение с сервером разорвано.
+            TimeoutError: Ответ не получен за время ожидания.
+
+        Returns:
+            VerifyResult: Результат авторизации.
+        """
+        # Ответы на новые запросы после разрыва соединения уже не будут прочитаны
+        if self.is_closed:
+            raise ConnectionError(self._closed_reason)
+
+        request_id = next(self._ids) & 0xFFFF_FFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            self._writer.write(encode_request(request_id, Opcode.VERIFY, access_token.encode()))
+            async with asyncio.timeout(self.timeout):
+                await self._writer.drain()
+                return await future
+
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def close(self) -> None:
+        """Закрывает соединение с сервером."""
+        self._reader_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._reader_task
+        self._writer.close()
+        with suppress(Exception):
+            await self._writer.wait_closed()
+
+    async def _read_responses(self) -> None:
+        reason = "Connection closed."
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME_HEADER.size)
+                (length,) = FRAME_HEADER.unpack(header)
+                body = await self._reader.readexactly(length)
+
+                request_id, result = decode_response(body)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result(result)
+
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError) as error:
+            reason = f"Connection lost: {error!r}"
+
+        finally:
+            self._closed_reason = reason
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(reason))
+            self._pending.clear()
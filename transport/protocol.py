@@ -0,0 +1,158 @@
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+from uuid import UUID
+
+# Кадр: длина тела (u32) и тело. Все числа в сетевом порядке байт.
+FRAME_HEADER = struct.Struct("!I")
+
+# Тело запроса: идентификатор запроса (u32), код операции (u8) и полезная нагрузка
+REQUEST_HEADER = struct.Struct("!IB")
+
+# Тело ответа: идентификатор запроса (u32), статус (u8) и полезная нагрузка
+RESPONSE_HEADER = struct.Struct("!IB")
+
+# Полезная нагрузка успешной авторизации: UUID (16 байт), флаги (u8) и имя в UTF-8
+USER_HEADER = struct.Struct("!16sB")
+
+FLAG_IS_ADMIN = 0b0000_0001
+
+
+class Opcode(IntEnum):
+    """Коды операций внутреннего протокола."""
+
+    VERIFY = 1
+
+
+class Status(IntEnum):
+    """Статусы ответов внутреннего протокола."""
+
+    OK = 0
+    INVALID_TOKEN = 1
+    USER_UNAVAILABLE = 2
+    BAD_REQUEST = 3
+    INTERNAL_ERROR = 4
+
+
+class ProtocolError(Exception):
+    """Нарушение формата внутреннего протокола."""
+
+
+@dataclass(frozen=True, slots=True)
+class VerifyResult:
+    """Результат авторизации, полученный по внутреннему протоколу."""
+
+    status: Status
+    id: Optional[UUID] = None
+    name: Optional[str] = None
+    is_admin: bool = False
+    detail: Optional[str] = None
+
+
+def encode_frame(body: bytes) -> bytes:
+    """Упаковывает тело сообщения в кадр с префиксом длины.
+
+    Args:
+        body (bytes): Тело сообщения.
+
+    Returns:
+        bytes: Кадр.
+    """
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def encode_request(request_id: int, opcode: Opcode, payload: bytes) -> bytes:
+    """Кодирует кадр запроса.
+
+    Args:
+        request_id (int): Идентификатор запроса в рамках соединения.
+        opcode (Opcode): Код операции.
+        payload (bytes): Полезная нагрузка.
+
+    Returns:
+        bytes: Кадр запроса.
+    """
+    return encode_frame(REQUEST_HEADER.pack(request_id, opcode) + payload)
+
+
+def decode_request(body: bytes) -> tuple[int, int, bytes]:
+    """Декодирует тело запроса.
+
+    Args:
+        body (bytes): Тело запроса.
+
+    Raises:
+        ProtocolError: Тело запроса короче заголовка.
+
+    Returns:
+        tuple[int, int, bytes]: Идентификатор запроса, код операции и полезная нагрузка.
+    """
+    if len(body) < REQUEST_HEADER.size:
+        raise ProtocolError("Request frame is too short.")
+
+    request_id, opcode = REQUEST_HEADER.unpack_from(body)
+    return request_id, opcode, body[REQUEST_HEADER.size :]
+
+
+def encode_user_response(request_id: int, user_id: UUID, name: str, is_admin: bool) -> bytes:
+    """Кодирует кадр ответа об успешной авторизации.
+
+    Args:
+        request_id (int): Идентификатор запроса.
+        user_id (UUID): UUID пользователя.
+        name (str): Имя пользователя.
+        is_admin (bool): Флаг админ прав.
+
+    Returns:
+        bytes: Кадр ответа.
+    """
+    flags = FLAG_IS_ADMIN if is_admin else 0
+    payload = USER_HEADER.pack(user_id.bytes, flags) + name.encode()
+    return encode_frame(RESPONSE_HEADER.pack(request_id, Status.OK) + payload)
+
+
+def encode_error_response(request_id: int, status: Status, detail: str) -> bytes:
+    """Кодирует кадр ответа с ошибкой.
+
+    Args:
+        request_id (int): Идентификатор запроса.
+        status (Status): Статус ошибки.
+        detail (str): Описание ошибки.
+
+    Returns:
+        bytes: Кадр ответа.
+    """
+    return encode_frame(RESPONSE_HEADER.pack(request_id, status) + detail.encode())
+
+
+def decode_response(body: bytes) -> tuple[int, VerifyResult]:
+    """Декодирует тело ответа.
+
+    Args:
+        body (bytes): Тело ответа.
+
+    Raises:
+        ProtocolError: Тело ответа не соответствует формату.
+
+    Returns:
+        tuple[int, VerifyResult]: Идентификатор запроса и результат авторизации.
+    """
+    if len(body) < RESPONSE_HEADER.size:
+        raise ProtocolError("Response frame is too short.")
+
+    request_id, status = RESPONSE_HEADER.unpack_from(body)
+    payload = body[RESPONSE_HEADER.size :]
+    if status != Status.OK:
+        return request_id, VerifyResult(status=Status(status), detail=payload.decode())
+
+    if len(payload) < USER_HEADER.size:
+        raise ProtocolError("User payload is too short.")
+
+    user_id, flags = USER_HEADER.unpack_from(payload)
+    return request_id, VerifyResult(
+        status=Status.OK,
+        id=UUID(bytes=user_id),
+        name=payload[USER_HEADER.size :].decode(),
+        is_admin=bool(flags & FLAG_IS_ADMIN),
+    )
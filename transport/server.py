@@ -0,0 +1,193 @@
+import asyncio
+import ipaddress
+import os
+import stat
+from contextlib import suppress
+from typing import Optional
+
+from configs import configs
+from database import create_read_session
+from service_logging import logger
+from utils.auth import InvalidTokenError, UserUnavailableError, authorize_access_token
+
+from .protocol import (
+    FRAME_HEADER,
+    Opcode,
+    ProtocolError,
+    Status,
+    decode_request,
+    encode_error_response,
+    encode_user_response,
+)
+
+
+# Права на Unix сокет: подключаться могут только владелец и его группа
+SOCKET_MODE = 0o660
+
+
+def is_loopback_host(host: str) -> bool:
+    """Проверяет, что адрес TCP сервера доступен только с того же хоста.
+
+    Args:
+        host (str): Адрес TCP сервера.
+
+    Returns:
+        bool: Флаг loopback адреса.
+    """
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class InternalVerifyServer:
+    """Внутренний сервер авторизации для сервисов, развернутых на том же хосте.
+
+    Слушает Unix сокет или локальный TCP порт и принимает кадры
+    компактного бинарного протокола (см. `transport.protocol`). Запросы
+    одного соединения обрабатываются конкурентно, поэтому клиент может
+    отправлять их конвейером, сопоставляя ответы по идентификатору запроса.
+
+    Авторизация выполняется той же функцией, что и `/verify`. Протокол
+    не аутентифицирует клиентов, поэтому доступ к серверу ограничивается
+    правами на Unix сокет или loopback адресом TCP сервера.
+    """
+
+    def __init__(self):
+        self._server: Optional[asyncio.Server] = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Запускает сервер, если он включен в конфигурации.
+
+        Raises:
+            ValueError: По пути сокета находится не сокет или адрес TCP сервера не loopback.
+        """
+        if not configs.internal.ENABLE or self._server is not None:
+            return
+
+        socket_path = configs.internal.SOCKET_PATH
+        if socket_path:
+            # Удаляется только сокет, оставшийся от предыдущего запуска
+            with suppress(FileNotFoundError):
+                if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                    raise ValueError(f"Internal transport path is not a socket: {socket_path}")
+                os.unlink(socket_path)
+            self._server = await asyncio.start_unix_server(self._handle_connection, socket_path)
+            os.chmod(socket_path, SOCKET_MODE)
+            address = socket_path
+        else:
+            if not is_loopback_host(configs.internal.HOST):
+                raise ValueError(
+                    f"Internal transport must listen on a loopback address: {configs.internal.HOST}"
+                )
+            self._server = await asyncio.start_server(
+                self._handle_connection,
+                configs.internal.HOST,
+                configs.internal.PORT,
+                reuse_port=True,
+            )
+            address = f"{configs.internal.HOST}:{configs.internal.PORT}"
+
+        logger.info(f"Internal verify transport listening on {address}")
+
+    async def stop(self) -> None:
+        """Останавливает сервер и закрывает открытые соединения."""
+        if self._server is None:
+            return
+
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection_task = asyncio.current_task()
+        self._connections.add(connection_task)
+        inflight = asyncio.Semaphore(configs.internal.MAX_INFLIGHT)
+        requests: set[asyncio.Task] = set()
+
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                (length,) = FRAME_HEADER.unpack(header)
+                if length > configs.internal.MAX_FRAME_SIZE:
+                    raise ProtocolError(f"Frame of {length} bytes exceeds the limit.")
+                body = await reader.readexactly(length)
+
+                await inflight.acquire()
+                task = asyncio.create_task(self._handle_request(body, writer))
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+                task.add_done_callback(lambda _: inflight.release())
+
+        except asyncio.IncompleteReadError:
+            # Клиент закончил отправку, ответы на принятые запросы еще нужны
+            await asyncio.gather(*requests, return_exceptions=True)
+
+        except ConnectionError:
+            pass
+
+        except ProtocolError as error:
+            logger.warning(f"Internal transport protocol error: {error}")
+
+        finally:
+            for task in requests:
+                task.cancel()
+            writer.close()
+            with suppress(Exception):
+                await writer.wait_closed()
+            self._connections.discard(connection_task)
+
+    async def _handle_request(self, body: bytes, writer: asyncio.StreamWriter) -> None:
+        request_id = 0
+        try:
+            request_id, opcode, payload = decode_request(body)
+            if opcode != Opcode.VERIFY:
+                response = encode_error_response(
+                    request_id, Status.BAD_REQUEST, f"Unknown opcode: {opcode}."
+                )
+            else:
+                response = await self._verify(request_id, payload)
+
+        except ProtocolError as error:
+            response = encode_error_response(request_id, Status.BAD_REQUEST, str(error))
+
+        except Exception as error:
+            logger.error(f"Internal verify failed: {error!r}")
+            response = encode_error_response(request_id, Status.INTERNAL_ERROR, "Internal error.")
+
+        writer.write(response)
+        with suppress(ConnectionError):
+            await writer.drain()
+
+    async def _verify(self, request_id: int, payload: bytes) -> bytes:
+        try:
+            access_token = payload.decode()
+        except UnicodeDecodeError:
+            raise ProtocolError("Access token is not valid UTF-8.")
+
+        session = create_read_session()
+        try:
+            user = await authorize_access_token(session, access_token)
+
+        except InvalidTokenError as error:
+            return encode_error_response(request_id, Status.INVALID_TOKEN, error.detail)
+
+        except UserUnavailableError as error:
+            return encode_error_response(request_id, Status.USER_UNAVAILABLE, error.detail)
+
+        finally:
+            await session.close()
+
+        return encode_user_response(request_id, user.id, user.name, user.is_admin)
+
+
+internal_server = InternalVerifyServer()
@@ -0,0 +1,224 @@
+import asyncio
+import contextvars
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Boolean, DateTime, Integer, Update, case, cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from configs import configs
+from database.engine import LocalAsyncSession
+from database.models import User
+from service_logging import logger
+from service_metrics import metrics
+
+from .tasks import PeriodicTask
+
+
+@dataclass(slots=True)
+class LoginActivity:
+    """Накопленная активность входа пользователя с момента последней записи.
+
+    Успешный вход сбрасывает счетчик неудачных попыток, поэтому
+    `failed_attempts` после него считаются от нуля (`is_reset`).
+    """
+
+    last_login_at: Optional[datetime] = None
+    is_reset: bool = False
+    failed_attempts: int = 0
+
+    def merge(self, newer: "LoginActivity") -> None:
+        """Дополняет активность более поздней.
+
+        Args:
+            newer (LoginActivity): Активность, накопленная позже текущей.
+        """
+        if newer.is_reset:
+            self.last_login_at = newer.last_login_at
+            self.is_reset = True
+            self.failed_attempts = newer.failed_attempts
+        else:
+            self.failed_attempts += newer.failed_attempts
+
+
+class LoginActivityBuffer:
+    """Буфер отложенной записи активности входа пользователей.
+
+    События входа объединяются в памяти по пользователю и периодически
+    записываются одним запросом `UPDATE ... FROM (VALUES ...)`, поэтому
+    вход не ждет записи и не блокирует строку пользователя. Число
+    пользователей в буфере ограничено `max_pending`: при переполнении
+    события новых пользователей отбрасываются, а запись запускается
+    досрочно. При ошибке записи активность возвращается в буфер.
+    """
+
+    def __init__(self, max_pending: int, batch_size: int, flush_interval: float):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._pending: dict[UUID, LoginActivity] = {}
+        self._lock = asyncio.Lock()
+        self._flush_task = PeriodicTask("login-activity-flush", flush_interval, self.flush)
+        self._early_flush: Optional[asyncio.Task] = None
+
+        self._dropped = metrics.counter(
+            "login_activity_dropped_total", "События входа, отброшенные при переполнении буфера."
+        )
+        self._flushed = metrics.counter(
+            "login_activity_flushed_total", "Записи активности входа, сохраненные в базу данных."
+        )
+        self._flush_time = metrics.histogram(
+            "login_activity_flush_seconds", "Длительность записи буфера активности входа."
+        )
+        metrics.gauge(
+            "login_activity_pending", "Пользователи с незаписанной активностью входа.", self.__len__
+        )
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record_success(self, user_id: UUID) -> None:
+        """Регистрирует успешный вход пользователя.
+
+        Args:
+            user_id (UUID): UUID пользователя.
+        """
+        now_time = datetime.now(timezone.utc)
+        self._record(user_id, LoginActivity(last_login_at=now_time, is_reset=True))
+
+    def record_failure(self, user_id: UUID) -> None:
+        """Регистрирует неудачную попытку входа пользователя.
+
+        Args:
+            user_id (UUID): UUID пользователя.
+        """
+        self._record(user_id, LoginActivity(failed_attempts=1))
+
+    def _record(self, user_id: UUID, activity: LoginActivity) -> None:
+        pending = self._pending.get(user_id)
+        if pending is not None:
+            pending.merge(activity)
+            return
+
+        if len(self._pending) >= self.max_pending:
+            self._dropped.inc()
+            self._schedule_flush()
+            return
+
+        self._pending[user_id] = activity
+
+    def _schedule_flush(self) -> None:
+        if self._early_flush is None or self._early_flush.done():
+            # Запись не должна наследовать бюджет времени запроса, вызвавшего ее
+            self._early_flush = asyncio.create_task(
+                self._safe_flush(), name="login-activity-flush", context=contextvars.Context()
+            )
+
+    async def _safe_flush(self) -> None:
+        try:
+            await self.flush()
+
+        except Exception as error:
+            logger.error(f"Login activity flush failed: {error!r}")
+
+    async def flush(self) -> None:
+        """Записывает накопленную активность в базу данных."""
+        async with self._lock:
+            if not self._pending:
+                return
+
+            batch, self._pending = self._pending, {}
+            started_at = time.perf_counter()
+            try:
+                items = list(batch.items())
+                async with LocalAsyncSession() as session:
+                    for offset in range(0, len(items), self.batch_size):
+                        stmt = update_activity_stmt(items[offset : offset + self.batch_size])
+                        await session.execute(stmt)
+                    await session.commit()
+
+            except Exception:
+                self._restore(batch)
+                raise
+
+            finally:
+                self._flush_time.observe(time.perf_counter() - started_at)
+
+            self._flushed.inc(len(batch))
+
+    def _restore(self, batch: dict[UUID, LoginActivity]) -> None:
+        # События, накопленные во время записи, новее возвращаемых
+        for user_id, activity in self._pending.items():
+            if user_id in batch:
+                batch[user_id].merge(activity)
+            else:
+                batch[user_id] = activity
+
+        self._pending = batch
+        while len(self._pending) > self.max_pending:
+            self._pending.pop(next(iter(self._pending)))
+            self._dropped.inc()
+
+    def start(self) -> None:
+        """Запускает периодическую запись буфера."""
+        self._flush_task.start()
+
+    async def stop(self) -> None:
+        """Останавливает периодическую запись и записывает остаток буфера."""
+        await self._flush_task.stop()
+        if self._early_flush is not None:
+            await self._early_flush
+
+        try:
+            await self.flush()
+
+        except Exception as error:
+            logger.error(f"Login activity flush on shutdown failed: {error!r}")
+
+
+def update_activity_stmt(items: list[tuple[UUID, LoginActivity]]) -> Update:
+    """Формирует запрос записи активности входа пачки пользователей.
+
+    Args:
+        items (list[tuple[UUID, LoginActivity]]): UUID пользователей и их активность.
+
+    Returns:
+        Update: Запрос обновления пользователей.
+    """
+    activity = values(
+        column("user_id", PG_UUID(as_uuid=True)),
+        column("last_login_at", DateTime(timezone=True)),
+        column("is_reset", Boolean),
+        column("failed_attempts", Integer),
+        name="activity",
+    ).data(
+        [
+            (user_id, item.last_login_at, item.is_reset, item.failed_attempts)
+            for user_id, item in items
+        ]
+    )
+
+    # NULL в VALUES не типизирован, поэтому время входа приводится явно
+    last_login_at = cast(activity.c.last_login_at, DateTime(timezone=True))
+
+    return (
+        update(User)
+        .where(User.id == activity.c.user_id)
+        .values(
+            last_login_at=func.coalesce(last_login_at, User.last_login_at),
+            failed_login_attempts=case(
+                (activity.c.is_reset, activity.c.failed_attempts),
+                else_=User.failed_login_attempts + activity.c.failed_attempts,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+login_activity = LoginActivityBuffer(
+    max_pending=configs.activity.MAX_PENDING,
+    batch_size=configs.activity.FLUSH_BATCH_SIZE,
+    flush_interval=configs.activity.FLUSH_INTERVAL,
+)
@@ -0,0 +1,159 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from service_metrics import metrics
+
+from .deadlines import DeadlineExceededError, remaining
+
+# Коэффициент сглаживания скользящей оценки длительности операции
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejectedError(Exception):
+    """Операция отклонена контроллером допуска из-за перегрузки."""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Контроллер допуска к ресурсоемким операциям.
+
+    Одновременно выполняется не более `concurrency` операций, остальные
+    ожидают в очереди длиной не более `queue_size`. Операция отклоняется
+    сразу, если очередь заполнена или ожидаемое время ожидания по скользящей
+    оценке длительности операций превышает `max_wait`, и по истечении
+    `max_wait`, если место так и не освободилось. Операции, которые не
+    успеют завершиться в бюджет времени запроса, отклоняются сразу.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, max_wait: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._service_time = 0.0
+
+        self._admitted = metrics.counter(
+            f"admission_{name}_admitted_total", "Операции, допущенные к выполнению."
+        )
+        self._rejected_queue_full = metrics.counter(
+            f"admission_{name}_rejected_queue_full_total",
+            "Операции, отклоненные из-за переполнения очереди.",
+        )
+        self._rejected_budget = metrics.counter(
+            f"admission_{name}_rejected_budget_total",
+            "Операции, отклоненные из-за превышения бюджета ожидания.",
+        )
+        self._rejected_timeout = metrics.counter(
+            f"admission_{name}_rejected_timeout_total",
+            "Операции, не дождавшиеся места за бюджет ожидания.",
+        )
+        self._rejected_deadline = metrics.counter(
+            f"admission_{name}_rejected_deadline_total",
+            "Операции, отклоненные из-за нехватки бюджета времени запроса.",
+        )
+        self._wait_time = metrics.histogram(
+            f"admission_{name}_wait_seconds", "Время ожидания в очереди."
+        )
+        metrics.gauge(
+            f"admission_{name}_in_flight", "Выполняемые операции.", lambda: self._in_flight
+        )
+        metrics.gauge(
+            f"admission_{name}_queue_depth", "Операции в очереди.", lambda: self._waiting
+        )
+
+    def estimated_wait(self) -> float:
+        """Оценивает время ожидания новой операции в секундах."""
+        if self._in_flight < self.concurrency and not self._waiting:
+            return 0.0
+
+        return (self._waiting + 1) / self.concurrency * self._service_time
+
+    def _reject(self, reason: str, wait: float) -> AdmissionRejectedError:
+        retry_after = max(1, math.ceil(max(wait, self._service_time)))
+        return AdmissionRejectedError(f"Service is overloaded: {reason}.", retry_after)
+
+    async def acquire(self) -> float:
+        """Занимает место для выполнения операции. Ожидание в очереди
+        ограничено `max_wait` и остатком бюджета текущего запроса.
+
+        Raises:
+            AdmissionRejectedError: Операция отклонена из-за перегрузки.
+            DeadlineExceededError: Бюджет запроса не позволяет дождаться выполнения.
+
+        Returns:
+            float: Момент допуска по `time.perf_counter()`, передаваемый в `release()`.
+        """
+        estimated_wait = self.estimated_wait()
+        if self._semaphore.locked():
+            if self._waiting >= self.queue_size:
+                self._rejected_queue_full.inc()
+                raise self._reject("queue is full", estimated_wait)
+
+            if estimated_wait > self.max_wait:
+                self._rejected_budget.inc()
+                raise self._reject("wait budget exceeded", estimated_wait)
+
+        # Операция, которая не успеет завершиться, только отнимет ресурсы у остальных
+        budget = remaining()
+        if budget is not None and budget < estimated_wait + self._service_time:
+            self._rejected_deadline.inc()
+            raise DeadlineExceededError()
+
+        max_wait = self.max_wait if budget is None else min(self.max_wait, budget)
+        started_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            async with asyncio.timeout(max_wait):
+                await self._semaphore.acquire()
+
+        except TimeoutError:
+            if max_wait < self.max_wait:
+                self._rejected_deadline.inc()
+                raise DeadlineExceededError() from None
+
+            self._rejected_timeout.inc()
+            raise self._reject("wait budget exceeded", self.max_wait) from None
+
+        finally:
+            self._waiting -= 1
+            self._wait_time.observe(time.perf_counter() - started_at)
+
+        self._admitted.inc()
+        self._in_flight += 1
+        return time.perf_counter()
+
+    def release(self, admitted_at: float) -> None:
+        """Освобождает место, занятое операцией.
+
+        Args:
+            admitted_at (float): Момент допуска, возвращенный `acquire()`.
+        """
+        self._in_flight -= 1
+        self._semaphore.release()
+        elapsed = time.perf_counter() - admitted_at
+        self._service_time += SERVICE_TIME_SMOOTHING * (elapsed - self._service_time)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Занимает место для выполнения операции на время контекста.
+
+        Raises:
+            AdmissionRejectedError: Операция отклонена из-за перегрузки.
+            DeadlineExceededError: Бюджет запроса не позволяет дождаться выполнения.
+        """
+        admitted_at = await self.acquire()
+        try:
+            yield
+
+        finally:
+            self.release(admitted_at)
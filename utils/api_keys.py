@@ -0,0 +1,192 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import secrets
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from database.engine import LocalAsyncSession
+from database.models import ApiKey
+from service_logging import logger
+
+from .tasks import PeriodicTask
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceAccount:
+    """Неизменяемый снимок действующего API ключа сервисного аккаунта."""
+
+    id: UUID
+    key_id: str
+    name: str
+    digest: str
+
+
+def key_digest(api_key: str) -> str:
+    """Вычисляет хеш API ключа для хранения в базе данных.
+    Ключ содержит достаточно случайных данных, поэтому медленное
+    хеширование, как для паролей, не требуется.
+
+    Args:
+        api_key (str): API ключ.
+
+    Returns:
+        str: SHA-256 хеш ключа в hex.
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class ApiKeyRegistry:
+    """Реестр действующих API ключей сервисных аккаунтов.
+
+    Ключ имеет вид `<префикс>_<key_id>_<секрет ключа>_<тег>`, где тег -
+    HMAC от `key_id` и секрета ключа на секрете сервера. Секрет ключа
+    случаен и нигде не хранится, поэтому ключ нельзя восстановить по
+    `key_id` и секрету сервера. Подлинность ключа проверяется пересчетом тега,
+    а действительность - по реестру в памяти, который периодически
+    перезагружается из таблицы `api_keys`. Поэтому проверка ключа не
+    обращается к базе данных, а отзыв ключа доходит до остальных воркеров
+    в течение периода обновления.
+    """
+
+    def __init__(self, secret: str, prefix: str, refresh_interval: float):
+        self._secret = secret.encode()
+        self.prefix = prefix
+        self._accounts: dict[str, ServiceAccount] = {}
+        # Изменения воркера применяются после перезагрузки, начатой до их фиксации
+        self._lock = asyncio.Lock()
+        self._refresh_task = PeriodicTask("api-keys-refresh", refresh_interval, self.refresh)
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def stats(self) -> dict:
+        """Возвращает сведения о состоянии реестра в памяти."""
+        return {"keys": len(self._accounts)}
+
+    def is_api_key(self, token: str) -> bool:
+        """Проверяет, имеет ли строка формат API ключа.
+
+        Args:
+            token (str): Проверяемая строка.
+
+        Returns:
+            bool: Флаг формата API ключа.
+        """
+        return token.startswith(f"{self.prefix}_")
+
+    def _tag(self, key_id: str, key_secret: str) -> str:
+        message = f"{key_id}_{key_secret}".encode()
+        digest = hmac.new(self._secret, message, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def verify(self, api_key: str) -> Optional[ServiceAccount]:
+        """Проверяет API ключ без обращения к базе данных.
+
+        Args:
+            api_key (str): API ключ.
+
+        Returns:
+            Optional[ServiceAccount]: Сервисный аккаунт ключа или `None`,
+            если ключ не подлинный, неизвестен или отозван.
+        """
+        parts = api_key.split("_", 3)
+        if len(parts) != 4 or parts[0] != self.prefix:
+            return None
+
+        # `compare_digest` принимает строки только из ASCII символов,
+        # поэтому сравниваются байтовые представления
+        _, key_id, key_secret, tag = parts
+        if not hmac.compare_digest(tag.encode(), self._tag(key_id, key_secret).encode()):
+            return None
+
+        account = self._accounts.get(key_id)
+        if account is None or not hmac.compare_digest(
+            account.digest.encode(), key_digest(api_key).encode()
+        ):
+            return None
+
+        return account
+
+    async def issue(self, db: AsyncSession, name: str) -> tuple[ApiKey, str]:
+        """Выпускает новый API ключ сервисного аккаунта.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия подключения к базе данных.
+            name (str): Имя сервисного аккаунта.
+
+        Returns:
+            tuple[ApiKey, str]: Запись ключа и сам ключ. Ключ не хранится
+            и доступен только в момент выпуска.
+        """
+        key_id = secrets.token_hex(8)
+        key_secret = secrets.token_hex(16)
+        api_key = f"{self.prefix}_{key_id}_{key_secret}_{self._tag(key_id, key_secret)}"
+
+        record = ApiKey(key_id=key_id, name=name, digest=key_digest(api_key))
+        db.add(record)
+        await db.commit()
+        await db.refresh(record)
+
+        async with self._lock:
+            self._accounts[key_id] = ServiceAccount(record.id, key_id, name, record.digest)
+        return record, api_key
+
+    async def revoke(self, db: AsyncSession, key_id: str) -> bool:
+        """Отзывает API ключ.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия подключения к базе данных.
+            key_id (str): Идентификатор ключа.
+
+        Returns:
+            bool: Флаг отзыва. `False`, если ключ не найден или уже отозван.
+        """
+        stmt = (
+            update(ApiKey)
+            .where(ApiKey.key_id == key_id, ApiKey.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+
+        async with self._lock:
+            self._accounts.pop(key_id, None)
+        return result.rowcount > 0
+
+    async def refresh(self) -> None:
+        """Перезагружает действующие ключи из базы данных."""
+        async with self._lock, LocalAsyncSession() as session:
+            stmt = select(ApiKey.id, ApiKey.key_id, ApiKey.name, ApiKey.digest).where(
+                ApiKey.revoked_at.is_(None)
+            )
+            result = await session.execute(stmt)
+            self._accounts = {row.key_id: ServiceAccount(**row._asdict()) for row in result}
+
+    async def start(self) -> None:
+        """Загружает действующие ключи и запускает их периодическое обновление."""
+        if configs.api_keys.SECRET is None:
+            logger.warning(
+                "AUTH_API_KEYS_SECRET is not set, API keys are signed with the JWT secret."
+            )
+
+        await self.refresh()
+        logger.info(f"Loaded {len(self._accounts)} API keys.")
+        self._refresh_task.start()
+
+    async def stop(self) -> None:
+        """Останавливает периодическое обновление ключей."""
+        await self._refresh_task.stop()
+
+
+api_keys = ApiKeyRegistry(
+    secret=configs.api_keys.SECRET or configs.jwt.SECRET,
+    prefix=configs.api_keys.PREFIX,
+    refresh_interval=configs.api_keys.REFRESH_INTERVAL,
+)
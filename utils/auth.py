@@ -1,30 +1,54 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from uuid import UUID
+from typing import Any, Optional
+from uuid import UUID, uuid4
 
 import jwt
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from configs import configs
-from database.models import User
+from service_tracing import tracer
 
+from .api_keys import ServiceAccount, api_keys
+from .cache import UserSnapshot
+from .revocation import revocation_list
+from .users import fetch_user, fetch_user_by_name
 
-async def identificate_user(db: AsyncSession, name: str) -> Optional[User]:
+# Токены без `jti`, выданные до его появления, принимаются без проверки отзыва
+# в течение времени жизни токена после запуска воркера, а затем отклоняются
+LEGACY_TOKENS_ISSUED_BEFORE = datetime.now(tz=timezone.utc)
+LEGACY_TOKENS_ACCEPTED_UNTIL = LEGACY_TOKENS_ISSUED_BEFORE + timedelta(
+    minutes=configs.jwt.ACCESS_TOKEN_LIFETIME
+)
+
+
+class AuthorizationError(Exception):
+    """Ошибка авторизации пользователя по токену доступа."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class InvalidTokenError(AuthorizationError):
+    """Токен доступа не действителен, не валиден или отозван."""
+
+
+class UserUnavailableError(AuthorizationError):
+    """Пользователь, которому выдан токен, заблокирован или не существует."""
+
+
+async def identificate_user(db: AsyncSession, name: str) -> Optional[UserSnapshot]:
     """Производит идентификацию пользхователя, путем поиска записи
-    о нем в базе данных.
+    о нем в кэше или базе данных.
 
     Args:
         db (AsyncSession): Асинхронная сессия подключения к базек данных.
         name (str): Имя пользователя.
 
     Returns:
-        Optional[User]: Обьект пользователя.
+        Optional[UserSnapshot]: Снимок пользователя.
     """
-    stmt = select(User).where(User.name == name)
-    result = await db.execute(stmt)
-
-    return result.scalar_one_or_none()
+    return await fetch_user_by_name(db, name)
 
 
 async def encode_access_token(subject: UUID, expiration_delta: Optional[timedelta] = None) -> str:
@@ -45,19 +69,67 @@ async def encode_access_token(subject: UUID, expiration_delta: Optional[timedelt
         "iss": configs.SERVICE_NAME,
         "exp": now_time + expiration_delta,
         "iat": now_time,
+        "jti": uuid4().hex,
     }
 
-    return jwt.encode(
-        payload=payload,
-        key=configs.jwt.SECRET,
-        algorithm=configs.jwt.ALGORITHM,
-    )
+    with tracer.span("jwt.encode"):
+        return jwt.encode(
+            payload=payload,
+            key=configs.jwt.SECRET,
+            algorithm=configs.jwt.ALGORITHM,
+        )
+
+
+def decode_access_token_payload(access_token: str) -> Optional[dict[str, Any]]:
+    """Декодирует и валидирует токен доступа, возвращая его полезную нагрузку.
+    В случае, если токен не действителен или не валиден, то
+    вернется `None`. Отзыв токена не проверяется.
+
+    Токен без `jti` принимается, только если он выдан до запуска воркера,
+    а с запуска прошло меньше времени жизни токена. Такой токен нельзя отозвать.
+
+    Args:
+        access_token (str): JWT Токен доступа.
+
+    Returns:
+        Optional[dict[str, Any]]: Полезная нагрузка токена.
+    """
+    with tracer.span("jwt.decode"):
+        try:
+            payload = jwt.decode(
+                jwt=access_token,
+                key=configs.jwt.SECRET,
+                algorithms=[configs.jwt.ALGORITHM],
+                issuer=configs.SERVICE_NAME,
+                leeway=2,
+                options={
+                    "require": [
+                        "exp",
+                        "iss",
+                        "sub",
+                        "iat",
+                    ]
+                },
+            )
+
+        except jwt.InvalidTokenError:
+            return None
+
+    if "jti" in payload:
+        return payload
+
+    now_time = datetime.now(tz=timezone.utc)
+    issued_at = datetime.fromtimestamp(payload["iat"], tz=timezone.utc)
+    if issued_at < LEGACY_TOKENS_ISSUED_BEFORE and now_time < LEGACY_TOKENS_ACCEPTED_UNTIL:
+        return payload
+
+    return None
 
 
 async def decode_access_token(access_token: str) -> Optional[UUID]:
     """Декодирует и валидирует токен доступа пользователя,
     возвращая `UUID` (subject) последнего.
-    В случае, если токен не действителен или не валиден, то
+    В случае, если токен не действителен, не валиден или отозван, то
     вернется `None`.
 
     Args:
@@ -66,25 +138,83 @@ async def decode_access_token(access_token: str) -> Optional[UUID]:
     Returns:
         Optional[UUID]: UUID пользователя.
     """
-    try:
-        payload = jwt.decode(
-            jwt=access_token,
-            key=configs.jwt.SECRET,
-            algorithms=[configs.jwt.ALGORITHM],
-            issuer=configs.SERVICE_NAME,
-            leeway=2,
-            options={
-                "require": [
-                    "exp",
-                    "iss",
-                    "sub",
-                    "iat",
-                ]
-            },
-        )
-
-    except (jwt.MissingRequiredClaimError, jwt.ExpiredSignatureError, jwt.InvalidIssuerError):
+    payload = decode_access_token_payload(access_token)
+    if payload is None:
         return None
 
+    # Токены без `jti` не отзываются
+    if "jti" in payload:
+        with tracer.span("revocation.check"):
+            is_revoked = await revocation_list.is_revoked(payload["jti"])
+
+        if is_revoked:
+            return None
+
     user_uuid = payload.get("sub")
     return UUID(user_uuid)
+
+
+async def revoke_access_token(access_token: str) -> bool:
+    """Отзывает токен доступа до истечения срока его действия.
+
+    Args:
+        access_token (str): JWT Токен доступа.
+
+    Returns:
+        bool: Флаг успешного отзыва. `False`, если токен не действителен,
+        не валиден или выдан без `jti`.
+    """
+    payload = decode_access_token_payload(access_token)
+    if payload is None or "jti" not in payload:
+        return False
+
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    await revocation_list.revoke(payload["jti"], expires_at)
+
+    return True
+
+
+async def authorize_access_token(db: AsyncSession, access_token: str) -> UserSnapshot:
+    """Авторизует пользователя по токену доступа.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия подключения к базе данных.
+        access_token (str): JWT Токен доступа.
+
+    Raises:
+        InvalidTokenError: Токен доступа не действителен, не валиден или отозван.
+        UserUnavailableError: Пользователь заблокирован или не существует.
+
+    Returns:
+        UserSnapshot: Снимок авторизованного пользователя.
+    """
+    user_id = await decode_access_token(access_token=access_token)
+    if user_id is None:
+        raise InvalidTokenError("Access token is invalid.")
+
+    user = await fetch_user(db, user_id)
+    if user is None or user.is_disabled:
+        raise UserUnavailableError("User account is disabled or does not exist.")
+
+    return user
+
+
+def authorize_api_key(api_key: str) -> ServiceAccount:
+    """Авторизует сервисный аккаунт по API ключу без обращения к базе данных.
+
+    Args:
+        api_key (str): API ключ сервисного аккаунта.
+
+    Raises:
+        InvalidTokenError: API ключ не подлинный, неизвестен или отозван.
+
+    Returns:
+        ServiceAccount: Авторизованный сервисный аккаунт.
+    """
+    with tracer.span("api_key.verify"):
+        account = api_keys.verify(api_key)
+
+    if account is None:
+        raise InvalidTokenError("API key is invalid.")
+
+    return account
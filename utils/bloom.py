@@ -0,0 +1,58 @@
+import hashlib
+import math
+from typing import Iterator
+
+
+class BloomFilter:
+    """Компактное вероятностное множество строк.
+
+    Проверка принадлежности может давать ложноположительные
+    ответы с заданной вероятностью, но никогда не дает
+    ложноотрицательных.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bits_count = max(bits, 8)
+        self._hashes_count = max(round(self._bits_count / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._bits_count + 7) // 8)
+        self._items_count = 0
+
+    def __len__(self) -> int:
+        return self._items_count
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def size_bytes(self) -> int:
+        """Размер битового массива фильтра в байтах."""
+        return len(self._bits)
+
+    @property
+    def is_saturated(self) -> bool:
+        """Флаг превышения расчетной емкости фильтра."""
+        return self._items_count > self.capacity
+
+    def add(self, item: str) -> None:
+        """Добавляет строку в фильтр.
+
+        Args:
+            item (str): Добавляемая строка.
+        """
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self._items_count += 1
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Двойное хеширование: k позиций из двух 64-битных половин одного дайджеста
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        for i in range(self._hashes_count):
+            yield (first + i * second) % self._bits_count
@@ -0,0 +1,181 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from configs import configs
+from database.notifications import listener
+from service_logging import logger
+
+USERS_CHANGES_CHANNEL = "users_changes"
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Неизменяемый снимок записи пользователя вместе с хешем его пароля."""
+
+    id: UUID
+    name: str
+    email: str
+    is_admin: bool
+    is_disabled: bool
+    version: int
+    password_hash: Optional[str]
+
+
+class UserCache:
+    """Ограниченный по размеру LRU кэш снимков пользователей.
+
+    Записи инвалидируются уведомлениями об изменении таблиц `users` и
+    `passwords`. Время жизни записей ограничивает устаревание данных
+    на случай потери соединения слушателя уведомлений.
+
+    Уведомления приходят с основного сервера, а чтение может идти с
+    отстающей реплики, поэтому в течение `quarantine` секунд после
+    инвалидации снимки пользователя не кэшируются.
+    """
+
+    def __init__(self, max_size: int, ttl: float, quarantine: float = 0.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.quarantine = quarantine
+        self._items: OrderedDict[UUID, tuple[float, UserSnapshot]] = OrderedDict()
+        self._names: dict[str, UUID] = {}
+        self._quarantined: dict[UUID, float] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict:
+        """Возвращает счетчики и размер кэша."""
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "generation": self.generation,
+        }
+
+    def get(self, user_id: UUID) -> Optional[UserSnapshot]:
+        """Возвращает снимок пользователя из кэша.
+
+        Args:
+            user_id (UUID): UUID пользователя.
+
+        Returns:
+            Optional[UserSnapshot]: Снимок пользователя, если он есть в кэше и не устарел.
+        """
+        entry = self._items.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._evict(user_id)
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(user_id)
+        self.hits += 1
+        return user
+
+    def get_by_name(self, name: str) -> Optional[UserSnapshot]:
+        """Возвращает снимок пользователя из кэша по имени.
+
+        Args:
+            name (str): Имя пользователя.
+
+        Returns:
+            Optional[UserSnapshot]: Снимок пользователя, если он есть в кэше и не устарел.
+        """
+        user_id = self._names.get(name)
+        if user_id is None:
+            self.misses += 1
+            return None
+
+        return self.get(user_id)
+
+    def put(self, user: UserSnapshot, generation: int) -> None:
+        """Помещает снимок пользователя в кэш.
+
+        Снимок отбрасывается, если с момента начала его загрузки
+        (`generation`) произошла инвалидация, иначе в кэш может попасть
+        устаревшая запись.
+
+        Args:
+            user (UserSnapshot): Снимок пользователя.
+            generation (int): Поколение кэша на момент начала загрузки снимка.
+        """
+        if generation != self.generation:
+            return
+
+        if self._quarantined.get(user.id, 0.0) > time.monotonic():
+            return
+
+        self._evict(user.id)
+        self._items[user.id] = (time.monotonic() + self.ttl, user)
+        self._names[user.name] = user.id
+
+        while len(self._items) > self.max_size:
+            oldest_id = next(iter(self._items))
+            self._evict(oldest_id)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Удаляет снимок пользователя из кэша.
+
+        Args:
+            user_id (UUID): UUID пользователя.
+        """
+        self.generation += 1
+        self._evict(user_id)
+
+        if self.quarantine > 0:
+            now_time = time.monotonic()
+            if len(self._quarantined) > self.max_size:
+                self._quarantined = {
+                    key: until for key, until in self._quarantined.items() if until > now_time
+                }
+            self._quarantined[user_id] = now_time + self.quarantine
+
+    def clear(self) -> None:
+        """Полностью очищает кэш."""
+        self.generation += 1
+        self._items.clear()
+        self._names.clear()
+
+    def _evict(self, user_id: UUID) -> None:
+        entry = self._items.pop(user_id, None)
+        if entry is not None and self._names.get(entry[1].name) == user_id:
+            del self._names[entry[1].name]
+
+    def handle_notification(self, payload: str) -> None:
+        """Обрабатывает уведомление об изменении пользователя.
+
+        Args:
+            payload (str): JSON полезная нагрузка уведомления.
+        """
+        data = json.loads(payload)
+        self.invalidate(UUID(data["id"]))
+
+    def handle_reconnect(self) -> None:
+        """Сбрасывает кэш после (пере)подключения слушателя,
+        так как часть уведомлений могла быть пропущена.
+        """
+        logger.info("User cache cleared after listener reconnect.")
+        self.clear()
+
+
+user_cache = UserCache(
+    max_size=configs.cache.USERS_MAX_SIZE,
+    ttl=configs.cache.USERS_TTL,
+    quarantine=configs.database.REPLICA_MAX_LAG if configs.database.REPLICA_URLS else 0.0,
+)
+
+listener.subscribe(USERS_CHANGES_CHANNEL, user_cache.handle_notification)
+listener.on_reconnect(user_cache.handle_reconnect)
@@ -0,0 +1,166 @@
+import asyncio
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs import configs
+from service_logging import logger
+from service_tracing import tracer
+
+# Момент истечения бюджета текущего запроса по `time.monotonic()`
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Бюджет времени запроса исчерпан."""
+
+    def __init__(self, detail: str = "Request deadline exceeded."):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def remaining() -> Optional[float]:
+    """Возвращает остаток бюджета текущего запроса в секундах.
+
+    Returns:
+        Optional[float]: Остаток бюджета или `None`, если бюджет не задан.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Проверяет, что бюджет текущего запроса не исчерпан.
+
+    Raises:
+        DeadlineExceededError: Бюджет исчерпан.
+    """
+    budget = remaining()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceededError()
+
+
+def statement_timeout_ms() -> Optional[int]:
+    """Возвращает таймаут запроса к БД для остатка бюджета в миллисекундах.
+
+    Returns:
+        Optional[int]: Таймаут или `None`, если бюджет не задан.
+    """
+    budget = remaining()
+    if budget is None:
+        return None
+
+    # Нулевое значение отключает таймаут в PostgreSQL
+    return max(1, math.ceil(budget * 1000))
+
+
+@contextmanager
+def deadline_scope(budget: float) -> Iterator[None]:
+    """Устанавливает бюджет времени для кода внутри контекста.
+    Вложенный бюджет не может превышать внешний.
+
+    Args:
+        budget (float): Бюджет в секундах.
+    """
+    deadline = time.monotonic() + budget
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def request_budget(request: Request) -> Optional[float]:
+    """Определяет бюджет времени запроса по настройкам его маршрута.
+    Заголовок запроса может только сократить бюджет.
+
+    Args:
+        request (Request): HTTP запрос.
+
+    Returns:
+        Optional[float]: Бюджет в секундах или `None` для маршрутов без бюджета.
+    """
+    budget = configs.deadline.DEFAULT
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            budget = configs.deadline.ROUTES.get(route.path, budget)
+            break
+
+    # Потоковые маршруты держат соединение открытым намеренно
+    if budget is None:
+        return None
+
+    header = request.headers.get(configs.deadline.HEADER)
+    if header is not None:
+        try:
+            budget = min(budget, max(0.0, float(header) / 1000))
+        except ValueError:
+            pass
+
+    return budget
+
+
+def deadline_exceeded_response() -> JSONResponse:
+    """Формирует ответ на запрос, не уложившийся в бюджет времени."""
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "Request deadline exceeded."},
+    )
+
+
+class DeadlineMiddleware:
+    """ASGI middleware, ограничивающее время обработки запроса бюджетом его маршрута.
+
+    Обработка выполняется в той же задаче, поэтому по истечении бюджета
+    она отменяется целиком, включая ожидающие запросы к БД, а клиент
+    получает ответ `504`, если ответ еще не начал отправляться.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_response_started = False
+        span = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal is_response_started
+            if message["type"] == "http.response.start":
+                is_response_started = True
+                # Трасса запроса завершается с началом ответа, как и отрезок
+                tracer.end_span(span)
+            await send(message)
+
+        budget = request_budget(Request(scope))
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            with deadline_scope(budget), tracer.span("middleware.deadline", budget=budget) as span:
+                async with asyncio.timeout(budget):
+                    await self.app(scope, receive, send_wrapper)
+
+        except TimeoutError:
+            logger.error(f"Request deadline of {budget:.3f}s exceeded.")
+            if not is_response_started:
+                await deadline_exceeded_response()(scope, receive, send)
@@ -0,0 +1,337 @@
+import asyncio
+import contextvars
+import hashlib
+import hmac
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Coroutine, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import Update, and_, delete, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import configs
+from database.engine import LocalAsyncSession
+from database.models import IdempotencyKey
+from service_logging import logger
+from service_metrics import metrics
+from service_tracing import tracer
+
+from .tasks import PeriodicTask
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """Ключ идемпотентности уже использован с другим телом запроса."""
+
+    def __init__(self, detail: str = "Idempotency key was used with a different request."):
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResponse:
+    """Ответ на запрос, сохраняемый для повтора по ключу идемпотентности."""
+
+    status_code: int
+    body: dict
+
+
+@dataclass(slots=True)
+class IdempotencyClaim:
+    """Захват ключа идемпотентности выполняющейся операцией.
+    Токен отличает захват от последующих перехватов той же записи.
+    """
+
+    scope: str
+    key: str
+    fingerprint: str
+    token: UUID = field(default_factory=uuid4)
+    is_completed: bool = False
+
+
+Operation = Callable[[IdempotencyClaim], Awaitable[StoredResponse]]
+
+
+class IdempotencyStore:
+    """Хранилище ответов на запросы с ключом идемпотентности.
+
+    Первый запрос с ключом захватывает запись в таблице `idempotency_keys`
+    на время `lease`, выполняет операцию и сохраняет ответ, который
+    возвращается повторам в течение `ttl` секунд без повторного выполнения
+    операции. Одновременные повторы в том же воркере ожидают общий результат
+    выполняющейся операции, а в других воркерах - появления ответа в таблице.
+    Захват, не завершенный за `lease` (например, из-за падения воркера),
+    может быть перехвачен повтором.
+
+    Операция, изменяющая данные, сохраняет ответ методом `complete`
+    в своей транзакции, чтобы изменения и ответ фиксировались вместе.
+    Иначе ответ сохраняется после завершения операции.
+
+    Сохраняются только ответы со статусом ниже `500`: при ошибке сервера
+    запись освобождается, и повтор выполнит операцию заново.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        ttl: float,
+        lease: float,
+        poll_interval: float,
+        max_poll_interval: float,
+        prune_interval: float,
+    ):
+        self._secret = secret.encode()
+        self.ttl = ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._in_flight: dict[tuple[str, str], tuple[str, asyncio.Future]] = {}
+        self._finishing: set[asyncio.Task] = set()
+        self._prune_task = PeriodicTask("idempotency-prune", prune_interval, self.prune)
+
+        self._replayed = metrics.counter(
+            "idempotency_replayed_total", "Запросы, получившие сохраненный ответ по ключу."
+        )
+        self._coalesced = metrics.counter(
+            "idempotency_coalesced_total", "Повторы, дождавшиеся выполняющейся операции."
+        )
+        metrics.gauge(
+            "idempotency_in_flight", "Операции с ключом идемпотентности в работе.", self.__len__
+        )
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def stats(self) -> dict:
+        """Возвращает сведения о выполняющихся операциях воркера."""
+        return {"in_flight": len(self._in_flight)}
+
+    def fingerprint(self, payload: str) -> str:
+        """Вычисляет отпечаток тела запроса. Тело может содержать пароль,
+        поэтому отпечаток вычисляется как HMAC на секрете сервера.
+
+        Args:
+            payload (str): Сериализованное тело запроса.
+
+        Returns:
+            str: Отпечаток тела запроса в hex.
+        """
+        return hmac.new(self._secret, payload.encode(), hashlib.sha256).hexdigest()
+
+    async def execute(
+        self, scope: str, key: str, fingerprint: str, operation: Operation
+    ) -> tuple[StoredResponse, bool]:
+        """Выполняет операцию не более одного раза для ключа идемпотентности.
+
+        Args:
+            scope (str): Область действия ключа (например, имя операции).
+            key (str): Ключ идемпотентности из запроса.
+            fingerprint (str): Отпечаток тела запроса.
+            operation (Operation): Операция, возвращающая ответ на запрос
+                и получающая захват ключа для сохранения ответа.
+
+        Raises:
+            IdempotencyKeyMismatchError: Ключ уже использован с другим телом запроса.
+
+        Returns:
+            tuple[StoredResponse, bool]: Ответ и флаг его повтора.
+        """
+        # Повторы в воркере ждут выполняющуюся операцию, а при ее сбое выполняют ее сами
+        while (in_flight := self._in_flight.get((scope, key))) is not None:
+            in_flight_fingerprint, future = in_flight
+            if in_flight_fingerprint != fingerprint:
+                raise IdempotencyKeyMismatchError()
+
+            result = await asyncio.shield(future)
+            if result is not None:
+                self._coalesced.inc()
+                return result[0], True
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[(scope, key)] = (fingerprint, future)
+        result = None
+        try:
+            result = await self._execute(scope, key, fingerprint, operation)
+            return result
+
+        finally:
+            del self._in_flight[(scope, key)]
+            future.set_result(result)
+
+    async def _execute(
+        self, scope: str, key: str, fingerprint: str, operation: Operation
+    ) -> tuple[StoredResponse, bool]:
+        while True:
+            claim = IdempotencyClaim(scope, key, fingerprint)
+            if await self._claim(claim):
+                try:
+                    response = await operation(claim)
+
+                except BaseException:
+                    await self._finish(self._release(claim))
+                    raise
+
+                # Ответ мог быть сохранен операцией в ее транзакции
+                if not claim.is_completed:
+                    if response.status_code < 500:
+                        await self._finish(self._complete(claim, response))
+                    else:
+                        await self._finish(self._release(claim))
+
+                return response, False
+
+            # Операцию выполняет другой воркер, ожидаем ее ответ. Период проверки
+            # растет экспоненциально, чтобы поток повторов не умножал нагрузку на базу данных
+            with tracer.span("idempotency.wait"):
+                interval = self.poll_interval
+                record = await self._load(scope, key)
+                while record is not None:
+                    if record.fingerprint != fingerprint:
+                        raise IdempotencyKeyMismatchError()
+
+                    if record.status_code is not None:
+                        break
+
+                    lease_left = record.locked_until - datetime.now(tz=timezone.utc)
+                    lease_left = lease_left.total_seconds()
+                    if lease_left < 0:
+                        break
+
+                    await asyncio.sleep(min(interval, lease_left + self.poll_interval))
+                    interval = min(interval * 2, self.max_poll_interval)
+                    record = await self._load(scope, key)
+
+            if record is None or record.status_code is None:
+                continue
+
+            self._replayed.inc()
+            return StoredResponse(record.status_code, record.response), True
+
+    async def complete(
+        self, db: AsyncSession, claim: IdempotencyClaim, response: StoredResponse
+    ) -> None:
+        """Сохраняет ответ операции в транзакции сессии операции.
+        Ответ будет зафиксирован вместе с изменениями операции.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия операции.
+            claim (IdempotencyClaim): Захват ключа идемпотентности.
+            response (StoredResponse): Ответ на запрос.
+        """
+        result = await db.execute(self._complete_stmt(claim, response))
+        if result.rowcount == 0:
+            logger.warning("Idempotency key claim was taken over, response is not stored.")
+        claim.is_completed = True
+
+    async def _finish(self, coro: Coroutine) -> None:
+        # Захват завершается вне бюджета запроса: по его истечении запросы к базе
+        # данных отменялись бы по `statement_timeout`, а отмена запроса не прерывает завершение
+        task = asyncio.create_task(coro, context=contextvars.Context())
+        self._finishing.add(task)
+        task.add_done_callback(self._finishing.discard)
+        await asyncio.shield(task)
+
+    async def _claim(self, claim: IdempotencyClaim) -> bool:
+        now_time = datetime.now(tz=timezone.utc)
+        stmt = insert(IdempotencyKey).values(
+            scope=claim.scope,
+            key=claim.key,
+            fingerprint=claim.fingerprint,
+            token=claim.token,
+            locked_until=now_time + timedelta(seconds=self.lease),
+            expires_at=now_time + timedelta(seconds=self.ttl),
+        )
+        # Перехватываются только истекшие записи и брошенные захваты
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "token": stmt.excluded.token,
+                "status_code": None,
+                "response": None,
+                "locked_until": stmt.excluded.locked_until,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=or_(
+                IdempotencyKey.expires_at < now_time,
+                and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until < now_time),
+            ),
+        ).returning(IdempotencyKey.key)
+
+        with tracer.span("idempotency.claim"):
+            async with LocalAsyncSession() as session:
+                result = await session.execute(stmt)
+                is_claimed = result.scalar_one_or_none() is not None
+                await session.commit()
+
+        return is_claimed
+
+    async def _load(self, scope: str, key: str) -> Optional[IdempotencyKey]:
+        async with LocalAsyncSession() as session:
+            return await session.get(IdempotencyKey, (scope, key))
+
+    def _complete_stmt(self, claim: IdempotencyClaim, response: StoredResponse) -> Update:
+        # Захват, перехваченный повтором после истечения `lease`, не перезаписывается
+        return (
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.scope == claim.scope,
+                IdempotencyKey.key == claim.key,
+                IdempotencyKey.token == claim.token,
+                IdempotencyKey.status_code.is_(None),
+            )
+            .values(status_code=response.status_code, response=response.body)
+        )
+
+    async def _complete(self, claim: IdempotencyClaim, response: StoredResponse) -> None:
+        try:
+            async with LocalAsyncSession() as session:
+                await session.execute(self._complete_stmt(claim, response))
+                await session.commit()
+
+        except Exception as error:
+            # Захват будет перехвачен повтором после истечения `lease`
+            logger.error(f"Idempotency key completion failed: {error!r}")
+
+    async def _release(self, claim: IdempotencyClaim) -> None:
+        stmt = delete(IdempotencyKey).where(
+            IdempotencyKey.scope == claim.scope,
+            IdempotencyKey.key == claim.key,
+            IdempotencyKey.token == claim.token,
+            IdempotencyKey.status_code.is_(None),
+        )
+        try:
+            async with LocalAsyncSession() as session:
+                await session.execute(stmt)
+                await session.commit()
+
+        except Exception as error:
+            # Захват будет перехвачен повтором после истечения `lease`
+            logger.error(f"Idempotency key release failed: {error!r}")
+
+    async def prune(self) -> None:
+        """Удаляет записи с истекшим сроком хранения."""
+        now_time = datetime.now(tz=timezone.utc)
+        async with LocalAsyncSession() as session:
+            stmt = delete(IdempotencyKey).where(IdempotencyKey.expires_at < now_time)
+            await session.execute(stmt)
+            await session.commit()
+
+    def start(self) -> None:
+        """Запускает периодическую очистку записей."""
+        self._prune_task.start()
+
+    async def stop(self) -> None:
+        """Останавливает периодическую очистку записей."""
+        await self._prune_task.stop()
+
+
+idempotency = IdempotencyStore(
+    secret=configs.jwt.SECRET,
+    ttl=configs.idempotency.TTL,
+    lease=configs.idempotency.LEASE,
+    poll_interval=configs.idempotency.POLL_INTERVAL,
+    max_poll_interval=configs.idempotency.MAX_POLL_INTERVAL,
+    prune_interval=configs.idempotency.PRUNE_INTERVAL,
+)
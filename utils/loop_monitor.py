@@ -0,0 +1,104 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from configs import configs
+from service_logging import logger
+from service_metrics import metrics
+
+from .tasks import PeriodicTask
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Количество кадров стека, попадающих в лог
+STACK_LIMIT = 30
+
+
+class LoopLagMonitor:
+    """Монитор задержки планирования цикла событий.
+
+    Фоновая задача цикла периодически отмечается и измеряет, насколько
+    позже ожидаемого она была запущена. Отдельный поток-сторож следит за
+    отметками: если цикл не отмечался дольше `threshold`, значит он занят
+    блокирующим вызовом, и сторож логирует текущий стек потока цикла,
+    указывающий на этот вызов.
+    """
+
+    def __init__(self, interval: float, threshold: float, is_enabled: bool = True):
+        self.is_enabled = is_enabled
+        self.interval = interval
+        self.threshold = threshold
+        self._beat_task = PeriodicTask("loop-lag-heartbeat", interval, self.beat)
+        self._last_beat = time.monotonic()
+        self._reported_beat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        self._lag = metrics.histogram(
+            "event_loop_lag_seconds", "Задержка планирования цикла событий.", LAG_BUCKETS
+        )
+        self._stalls = metrics.counter(
+            "event_loop_stalls_total", "Блокировки цикла событий дольше порога."
+        )
+
+    async def beat(self) -> None:
+        """Отмечает работу цикла и измеряет задержку с прошлой отметки."""
+        now_time = time.monotonic()
+        lag = max(0.0, now_time - self._last_beat - self.interval)
+        self._last_beat = now_time
+        self._lag.observe(lag)
+
+        if lag > self.threshold:
+            logger.warning(f"Event loop was blocked for {lag:.3f}s.")
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.threshold / 2):
+            last_beat = self._last_beat
+            stalled_for = time.monotonic() - last_beat - self.interval
+            if stalled_for <= self.threshold or self._reported_beat == last_beat:
+                continue
+
+            # Об одной блокировке сообщаем один раз
+            self._reported_beat = last_beat
+            self._stalls.inc()
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+            logger.warning(
+                f"Event loop blocked for more than {stalled_for:.3f}s, loop thread stack:\n{stack}"
+            )
+
+    def start(self) -> None:
+        """Запускает отметки цикла и поток-сторож, если монитор включен."""
+        if not self.is_enabled:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._beat_task.start()
+
+        self._stopped.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Останавливает отметки цикла и поток-сторож."""
+        await self._beat_task.stop()
+        self._stopped.set()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+
+loop_monitor = LoopLagMonitor(
+    interval=configs.loop_monitor.INTERVAL,
+    threshold=configs.loop_monitor.THRESHOLD,
+    is_enabled=configs.loop_monitor.ENABLE,
+)
@@ -0,0 +1,225 @@
+import gc
+import itertools
+import resource
+import sys
+import tracemalloc
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+
+from database import replicas
+from database.engine import engine
+
+from .activity import login_activity
+from .api_keys import api_keys
+from .cache import user_cache
+from .idempotency import idempotency
+from .revocation import revocation_list
+from .user_events import user_events
+
+# Кадры самого профилировщика и загрузчика модулей не относятся к приложению
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def module_name(filename: str, modules: dict[str, str]) -> str:
+    """Определяет имя модуля по пути к его файлу.
+
+    Args:
+        filename (str): Путь к файлу.
+        modules (dict[str, str]): Имена загруженных модулей по путям их файлов.
+
+    Returns:
+        str: Имя модуля или путь к файлу, если модуль не найден.
+    """
+    return modules.get(filename, filename)
+
+
+def loaded_modules() -> dict[str, str]:
+    """Возвращает имена загруженных модулей по путям их файлов."""
+    return {
+        module.__file__: name
+        for name, module in list(sys.modules.items())
+        if getattr(module, "__file__", None)
+    }
+
+
+class MemoryProfiler:
+    """Профилировщик выделений памяти процесса на основе `tracemalloc`.
+
+    Хранит не более `max_snapshots` последних снимков. Статистика снимков
+    и их разницы группируется по модулям, выделившим память.
+    """
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._snapshots: OrderedDict[int, tracemalloc.Snapshot] = OrderedDict()
+        self._counter = itertools.count(1)
+
+    def status(self) -> dict:
+        """Возвращает состояние профилировщика."""
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "is_tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": list(self._snapshots),
+        }
+
+    def start(self, frames: int = 1) -> None:
+        """Запускает отслеживание выделений памяти.
+
+        Args:
+            frames (int): Глубина сохраняемого стека выделения.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Останавливает отслеживание и удаляет снимки."""
+        tracemalloc.stop()
+        self._snapshots.clear()
+
+    def take_snapshot(self) -> int:
+        """Снимает снимок выделений памяти.
+
+        Raises:
+            RuntimeError: Отслеживание не запущено.
+
+        Returns:
+            int: Идентификатор снимка.
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Memory tracing is not started.")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        snapshot_id = next(self._counter)
+        self._snapshots[snapshot_id] = snapshot
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+
+        return snapshot_id
+
+    def _get_snapshot(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise LookupError(f"Snapshot {snapshot_id} not found.")
+
+        return snapshot
+
+    def top(self, snapshot_id: int, limit: int = 20) -> list[dict]:
+        """Возвращает модули, удерживающие больше всего памяти в снимке.
+
+        Args:
+            snapshot_id (int): Идентификатор снимка.
+            limit (int): Количество модулей.
+
+        Raises:
+            LookupError: Снимок не найден.
+
+        Returns:
+            list[dict]: Размер и количество блоков по модулям.
+        """
+        modules = loaded_modules()
+        grouped: dict[str, dict] = {}
+        for stat in self._get_snapshot(snapshot_id).statistics("filename"):
+            name = module_name(stat.traceback[0].filename, modules)
+            item = grouped.setdefault(name, {"module": name, "size": 0, "count": 0})
+            item["size"] += stat.size
+            item["count"] += stat.count
+
+        return sorted(grouped.values(), key=lambda item: item["size"], reverse=True)[:limit]
+
+    def diff(self, from_id: int, to_id: int, limit: int = 20) -> list[dict]:
+        """Возвращает модули с наибольшим изменением удерживаемой памяти между снимками.
+
+        Args:
+            from_id (int): Идентификатор предыдущего снимка.
+            to_id (int): Идентификатор последующего снимка.
+            limit (int): Количество модулей.
+
+        Raises:
+            LookupError: Снимок не найден.
+
+        Returns:
+            list[dict]: Изменение размера и количества блоков по модулям.
+        """
+        modules = loaded_modules()
+        grouped: dict[str, dict] = {}
+        stats = self._get_snapshot(to_id).compare_to(self._get_snapshot(from_id), "filename")
+        for stat in stats:
+            name = module_name(stat.traceback[0].filename, modules)
+            item = grouped.setdefault(
+                name, {"module": name, "size": 0, "size_diff": 0, "count": 0, "count_diff": 0}
+            )
+            item["size"] += stat.size
+            item["size_diff"] += stat.size_diff
+            item["count"] += stat.count
+            item["count_diff"] += stat.count_diff
+
+        return sorted(grouped.values(), key=lambda item: abs(item["size_diff"]), reverse=True)[
+            :limit
+        ]
+
+
+def process_memory() -> dict:
+    """Возвращает сведения о памяти процесса."""
+    rss: Optional[int] = None
+    try:
+        with open("/proc/self/statm") as file:
+            rss = int(file.read().split()[1]) * resource.getpagesize()
+
+    except OSError:
+        pass
+
+    return {
+        "rss_bytes": rss,
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "gc_counts": gc.get_count(),
+    }
+
+
+def generic_models_count() -> Optional[int]:
+    """Возвращает количество параметризованных generic моделей pydantic
+    (например, `PaginatedResponse[UserResponse]`) в кэше pydantic.
+    """
+    try:
+        from pydantic._internal._generics import _GENERIC_TYPES_CACHE
+
+    except ImportError:
+        return None
+
+    # В зависимости от версии pydantic кэш хранится в словаре или в переменной контекста
+    cache = _GENERIC_TYPES_CACHE
+    if isinstance(cache, ContextVar):
+        cache = cache.get(None)
+
+    return len(cache) if cache is not None else None
+
+
+def cache_report() -> dict:
+    """Возвращает размеры кэшей, которые сервис держит в памяти."""
+    compiled_cache = getattr(engine.sync_engine, "_compiled_cache", None)
+    return {
+        "user_cache": user_cache.stats(),
+        "revocation_list": revocation_list.stats(),
+        "replicas": replicas.stats(),
+        "login_activity": {"pending": len(login_activity)},
+        "api_keys": api_keys.stats(),
+        "user_events": user_events.stats(),
+        "idempotency": idempotency.stats(),
+        "pydantic": {"generic_models": generic_models_count()},
+        "sqlalchemy": {
+            "compiled_cache": len(compiled_cache) if compiled_cache is not None else None,
+            "pool": engine.pool.status(),
+        },
+    }
+
+
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+import bcrypt as bc
+
+from configs import configs
+from service_tracing import tracer
+
+from .admission import AdmissionController
+
+T = TypeVar("T")
+
+# bcrypt освобождает GIL на время хеширования, поэтому операции
+# выполняются параллельно в потоках, не блокируя цикл событий
+_executor = ThreadPoolExecutor(
+    max_workers=configs.admission.PASSWORD_CONCURRENCY,
+    thread_name_prefix="password",
+)
+
+password_admission = AdmissionController(
+    name="password",
+    concurrency=configs.admission.PASSWORD_CONCURRENCY,
+    queue_size=configs.admission.PASSWORD_QUEUE_SIZE,
+    max_wait=configs.admission.PASSWORD_MAX_WAIT,
+)
+
+
+async def _run_admitted(name: str, func: Callable[..., T], *args) -> T:
+    # Место освобождается по завершении операции в потоке, а не при отмене
+    # ожидающего ее запроса, иначе отмененные операции превысили бы лимит
+    with tracer.span("admission.wait"):
+        admitted_at = await password_admission.acquire()
+    loop = asyncio.get_running_loop()
+    try:
+        future = _executor.submit(func, *args)
+
+    except BaseException:
+        password_admission.release(admitted_at)
+        raise
+
+    future.add_done_callback(
+        lambda _: loop.call_soon_threadsafe(password_admission.release, admitted_at)
+    )
+    with tracer.span(name):
+        return await asyncio.wrap_future(future)
+
+
+def _hash_password(password: str) -> str:
+    return bc.hashpw(password.encode(), bc.gensalt()).decode()
+
+
+def _check_password(password: str, password_hash: str) -> bool:
+    return bc.checkpw(password.encode(), password_hash.encode())
+
+
+async def hash_password(password: str) -> str:
+    """Хеширует пароль с учетом контроля допуска.
+
+    Args:
+        password (str): Пароль.
+
+    Raises:
+        AdmissionRejectedError: Операция отклонена из-за перегрузки.
+        DeadlineExceededError: Бюджет запроса не позволяет выполнить операцию.
+
+    Returns:
+        str: Хеш пароля.
+    """
+    return await _run_admitted("bcrypt.hash", _hash_password, password)
+
+
+async def check_password(password: str, password_hash: str) -> bool:
+    """Сверяет пароль с хешем с учетом контроля допуска.
+
+    Args:
+        password (str): Пароль.
+        password_hash (str): Хеш пароля.
+
+    Raises:
+        AdmissionRejectedError: Операция отклонена из-за перегрузки.
+        DeadlineExceededError: Бюджет запроса не позволяет выполнить операцию.
+
+    Returns:
+        bool: Флаг совпадения пароля.
+    """
+    return await _run_admitted("bcrypt.check", _check_password, password, password_hash)
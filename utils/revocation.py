@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from configs import configs
+from database.engine import LocalAsyncSession
+from database.models import RevokedToken
+from service_logging import logger
+
+from .bloom import BloomFilter
+from .tasks import PeriodicTask
+
+
+class RevocationList:
+    """Список отозванных токенов доступа.
+
+    Источником истины является таблица `revoked_tokens`, а каждый воркер
+    держит в памяти фильтр Блума по `jti` отозванных токенов. Фильтр
+    инкрементально дополняется новыми записями таблицы, поэтому проверка
+    неотозванного токена не обращается к базе данных. Положительный ответ
+    фильтра подтверждается запросом к таблице.
+
+    Записи удаляются из таблицы после истечения срока действия токена,
+    после чего фильтр перестраивается.
+
+    Идентификаторы записей выделяются при вставке, а не при фиксации,
+    поэтому новые записи читаются по времени отзыва с запасом `lookback`
+    назад: запись, зафиксированная позже записей с большим временем отзыва,
+    не пропускается. Изменения фильтра выполняются под блокировкой, чтобы
+    перестроение не потеряло записи, добавленные во время его работы.
+    """
+
+    def __init__(self):
+        self._bloom = self._create_bloom(0)
+        # Наибольшее время отзыва среди прочитанных записей
+        self._cursor: Optional[datetime] = None
+        self._lookback = timedelta(seconds=configs.revocation.REFRESH_LOOKBACK)
+        self._lock = asyncio.Lock()
+
+        self._refresh_task = PeriodicTask(
+            "revocation-refresh", configs.revocation.REFRESH_INTERVAL, self.refresh
+        )
+        self._prune_task = PeriodicTask(
+            "revocation-prune", configs.revocation.PRUNE_INTERVAL, self.prune
+        )
+
+    @staticmethod
+    def _create_bloom(items_count: int) -> BloomFilter:
+        capacity = max(configs.revocation.BLOOM_CAPACITY, items_count * 2)
+        return BloomFilter(capacity, configs.revocation.BLOOM_ERROR_RATE)
+
+    def stats(self) -> dict:
+        """Возвращает сведения о состоянии фильтра в памяти."""
+        return {
+            "items": len(self._bloom),
+            "capacity": self._bloom.capacity,
+            "size_bytes": self._bloom.size_bytes,
+            "cursor": self._cursor.isoformat() if self._cursor is not None else None,
+        }
+
+    async def start(self) -> None:
+        """Загружает отозванные токены и запускает фоновое обновление фильтра."""
+        await self.rebuild()
+        self._refresh_task.start()
+        self._prune_task.start()
+
+    async def stop(self) -> None:
+        """Останавливает фоновое обновление фильтра."""
+        await self._refresh_task.stop()
+        await self._prune_task.stop()
+
+    async def refresh(self) -> None:
+        """Дополняет фильтр записями, появившимися после последнего обновления."""
+        async with self._lock:
+            if self._cursor is None:
+                await self._rebuild()
+                return
+
+            async with LocalAsyncSession() as session:
+                stmt = select(RevokedToken.jti, RevokedToken.revoked_at).where(
+                    RevokedToken.revoked_at > self._cursor - self._lookback
+                )
+                result = await session.execute(stmt)
+                rows = result.all()
+
+            for jti, revoked_at in rows:
+                # Записи из окна запаса читаются повторно и не должны переполнять фильтр
+                if jti not in self._bloom:
+                    self._bloom.add(jti)
+                self._cursor = max(self._cursor, revoked_at)
+
+            # Переполненный фильтр теряет точность, поэтому строим его заново
+            if self._bloom.is_saturated:
+                await self._rebuild()
+
+    async def rebuild(self) -> None:
+        """Строит фильтр заново по всем действующим записям таблицы."""
+        async with self._lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        now_time = datetime.now(tz=timezone.utc)
+        async with LocalAsyncSession() as session:
+            stmt = select(RevokedToken.jti, RevokedToken.revoked_at).where(
+                RevokedToken.expires_at >= now_time
+            )
+            result = await session.execute(stmt)
+            rows = result.all()
+
+        bloom = self._create_bloom(len(rows))
+        cursor = self._cursor
+        for jti, revoked_at in rows:
+            bloom.add(jti)
+            cursor = revoked_at if cursor is None else max(cursor, revoked_at)
+
+        self._bloom = bloom
+        self._cursor = cursor if cursor is not None else now_time
+        logger.info(f"Revocation filter rebuilt: {len(rows)} tokens.")
+
+    async def prune(self) -> None:
+        """Удаляет записи о токенах с истекшим сроком действия и перестраивает фильтр."""
+        now_time = datetime.now(tz=timezone.utc)
+        async with LocalAsyncSession() as session:
+            stmt = delete(RevokedToken).where(RevokedToken.expires_at < now_time)
+            await session.execute(stmt)
+            await session.commit()
+
+        await self.rebuild()
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Отзывает токен доступа.
+
+        Args:
+            jti (str): Идентификатор токена.
+            expires_at (datetime): Момент истечения срока действия токена.
+        """
+        async with LocalAsyncSession() as session:
+            stmt = (
+                insert(RevokedToken)
+                .values(jti=jti, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+        # Остальные воркеры увидят запись при следующем обновлении
+        async with self._lock:
+            self._bloom.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Проверяет, отозван ли токен доступа.
+
+        Args:
+            jti (str): Идентификатор токена.
+
+        Returns:
+            bool: Флаг отзыва токена.
+        """
+        if jti not in self._bloom:
+            return False
+
+        async with LocalAsyncSession() as session:
+            stmt = select(RevokedToken.id).where(RevokedToken.jti == jti)
+            result = await session.execute(stmt)
+
+            return result.scalar_one_or_none() is not None
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,48 @@
+import asyncio
+from contextlib import suppress
+from typing import Awaitable, Callable, Optional
+
+from service_logging import logger
+
+
+class PeriodicTask:
+    """Фоновая задача, периодически вызывающая переданную корутину
+    в цикле событий приложения.
+
+    Ошибки отдельных вызовов логируются и не прерывают задачу.
+    """
+
+    def __init__(self, name: str, interval: float, callback: Callable[[], Awaitable[None]]):
+        self.name = name
+        self.interval = interval
+        self._callback = callback
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Флаг работы фоновой задачи."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу, если она еще не запущена."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и дожидается ее завершения."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._callback()
+
+            except Exception as error:
+                logger.error(f"Periodic task '{self.name}' failed: {error!r}")
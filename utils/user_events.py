@@ -0,0 +1,322 @@
+import asyncio
+import contextvars
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select
+
+from configs import configs
+from database.engine import LocalAsyncSession
+from database.models import UserEvent
+from database.notifications import listener
+from service_logging import logger
+from service_metrics import metrics
+
+from .tasks import PeriodicTask
+
+USER_EVENTS_CHANNEL = "user_events"
+
+
+@dataclass(frozen=True, slots=True)
+class UserChange:
+    """Неизменяемое событие изменения пользователя со смещением в журнале событий."""
+
+    offset: int
+    user_id: UUID
+    version: int
+    is_admin: bool
+    is_disabled: bool
+    op: str
+
+    def to_dict(self) -> dict:
+        """Возвращает событие в виде, пригодном для сериализации в JSON."""
+        return {
+            "id": str(self.user_id),
+            "version": self.version,
+            "is_admin": self.is_admin,
+            "is_disabled": self.is_disabled,
+            "op": self.op,
+        }
+
+
+class Subscription:
+    """Подписка на поток событий с ограниченной очередью.
+
+    При переполнении очереди подписка закрывается: подписчик дочитывает
+    поток до конца и должен переподключиться, продолжив со смещения
+    последнего полученного события.
+    """
+
+    def __init__(self, queue_size: int):
+        self._queue: asyncio.Queue[Optional[UserChange]] = asyncio.Queue(queue_size)
+        self.is_overflowed = False
+
+    def put(self, event: UserChange) -> bool:
+        """Помещает событие в очередь подписки.
+
+        Args:
+            event (UserChange): Событие изменения пользователя.
+
+        Returns:
+            bool: Флаг успешной постановки. `False`, если очередь переполнена.
+        """
+        try:
+            self._queue.put_nowait(event)
+
+        except asyncio.QueueFull:
+            self.is_overflowed = True
+            self.close()
+            return False
+
+        return True
+
+    def close(self) -> None:
+        """Закрывает подписку: подписчик получит маркер конца потока
+        вместо необработанных событий и должен переподключиться.
+        """
+        # Место под маркер конца потока освобождаем за счет необработанных событий
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[UserChange]:
+        """Ожидает следующее событие подписки.
+
+        Args:
+            timeout (float): Время ожидания в секундах.
+
+        Raises:
+            TimeoutError: Событие не поступило за время ожидания.
+
+        Returns:
+            Optional[UserChange]: Событие или `None`, если подписка закрыта.
+        """
+        async with asyncio.timeout(timeout):
+            return await self._queue.get()
+
+
+@dataclass(frozen=True, slots=True)
+class Replay:
+    """Результат повтора событий из журнала."""
+
+    events: list[UserChange]
+    is_complete: bool
+
+
+class UserEventsHub:
+    """Раздача событий изменения пользователей подписчикам воркера.
+
+    События записываются триггерами таблицы `users` в журнал `user_events`
+    и рассылаются уведомлениями `LISTEN/NOTIFY` с полным содержимым
+    события, поэтому живые события доходят до подписчиков без запросов
+    к базе данных. Журнал хранится `retention` секунд и позволяет
+    подписчику продолжить поток со смещения последнего полученного события.
+
+    Уведомления приходят в порядке фиксации транзакций, а смещения
+    назначаются при вставке, поэтому событие с меньшим смещением может
+    прийти после события с большим. Повтор захватывает события за
+    `lookback` секунд до последнего полученного, чтобы не пропустить такие.
+
+    Доставка гарантируется не менее одного раза: при переподключении
+    события могут повторяться, поэтому подписчики применяют их по версии
+    записи пользователя.
+    """
+
+    def __init__(
+        self,
+        retention: float,
+        prune_interval: float,
+        replay_limit: int,
+        replay_lookback: float,
+        queue_size: int,
+    ):
+        self.retention = retention
+        self.replay_limit = replay_limit
+        self.replay_lookback = timedelta(seconds=replay_lookback)
+        self.queue_size = queue_size
+        self._subscriptions: set[Subscription] = set()
+        self._cursor = 0
+        self._catch_up: Optional[asyncio.Task] = None
+        self._prune_task = PeriodicTask("user-events-prune", prune_interval, self.prune)
+
+        self._published = metrics.counter(
+            "user_events_published_total", "События изменения пользователей, разосланные воркером."
+        )
+        self._overflows = metrics.counter(
+            "user_events_overflows_total", "Подписки, закрытые из-за переполнения очереди."
+        )
+        metrics.gauge(
+            "user_events_subscribers", "Открытые подписки на события пользователей.", self.__len__
+        )
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def head(self) -> int:
+        """Смещение последнего события, известного воркеру."""
+        return self._cursor
+
+    def stats(self) -> dict:
+        """Возвращает сведения о подписках и журнале событий."""
+        return {"subscribers": len(self._subscriptions), "cursor": self._cursor}
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        """Открывает подписку на живые события на время контекста.
+
+        Yields:
+            Subscription: Подписка на события.
+        """
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event: UserChange) -> None:
+        """Рассылает событие всем подписчикам воркера.
+
+        Args:
+            event (UserChange): Событие изменения пользователя.
+        """
+        self._cursor = max(self._cursor, event.offset)
+        self._published.inc()
+        for subscription in tuple(self._subscriptions):
+            if not subscription.put(event):
+                self._subscriptions.discard(subscription)
+                self._overflows.inc()
+                logger.warning("User events subscription closed: queue is full.")
+
+    def handle_notification(self, payload: str) -> None:
+        """Обрабатывает уведомление о событии изменения пользователя.
+
+        Args:
+            payload (str): JSON запись журнала событий.
+        """
+        data = json.loads(payload)
+        self.publish(
+            UserChange(
+                offset=data["id"],
+                user_id=UUID(data["user_id"]),
+                version=data["version"],
+                is_admin=data["is_admin"],
+                is_disabled=data["is_disabled"],
+                op=data["op"],
+            )
+        )
+
+    def handle_reconnect(self) -> None:
+        """Рассылает события, пропущенные за время разрыва соединения слушателя.
+        Если их не удалось повторить полностью, подписки закрываются.
+        """
+        if self._catch_up is None or self._catch_up.done():
+            self._catch_up = asyncio.create_task(
+                self._safe_catch_up(), name="user-events-catch-up", context=contextvars.Context()
+            )
+
+    async def _safe_catch_up(self) -> None:
+        try:
+            replay = await self.replay(self._cursor)
+            for event in replay.events:
+                self.publish(event)
+
+            if replay.is_complete:
+                return
+
+            logger.warning("User events catch-up truncated, closing subscriptions.")
+
+        except Exception as error:
+            logger.error(f"User events catch-up failed, closing subscriptions: {error!r}")
+
+        # Подписчики переподключатся и получат полный повтор или `resync`
+        self.close_subscriptions()
+
+    def close_subscriptions(self) -> None:
+        """Закрывает все подписки воркера."""
+        for subscription in tuple(self._subscriptions):
+            subscription.close()
+        self._subscriptions.clear()
+
+    async def replay(self, after: int) -> Replay:
+        """Читает из журнала события, следующие за смещением, а также
+        события, записанные не более чем за `replay_lookback` до него:
+        их транзакции могли зафиксироваться позже события со смещением.
+
+        Повтор неполон, если часть событий после смещения уже удалена
+        из журнала или их больше `replay_limit`.
+
+        Args:
+            after (int): Смещение последнего полученного события.
+
+        Returns:
+            Replay: События по возрастанию смещения и флаг полноты повтора.
+        """
+        async with LocalAsyncSession() as session:
+            oldest = await session.scalar(select(func.min(UserEvent.id)))
+            after_time = (
+                select(UserEvent.created_at).where(UserEvent.id == after).scalar_subquery()
+            )
+            stmt = (
+                select(
+                    UserEvent.id.label("offset"),
+                    UserEvent.user_id,
+                    UserEvent.version,
+                    UserEvent.is_admin,
+                    UserEvent.is_disabled,
+                    UserEvent.op,
+                )
+                .where(
+                    or_(
+                        UserEvent.id > after,
+                        UserEvent.created_at >= after_time - self.replay_lookback,
+                    )
+                )
+                .order_by(UserEvent.id)
+                .limit(self.replay_limit + 1)
+            )
+            result = await session.execute(stmt)
+            events = [UserChange(**row._asdict()) for row in result]
+
+        is_complete = (oldest is None or after >= oldest - 1) and len(events) <= self.replay_limit
+        return Replay(events=events[: self.replay_limit], is_complete=is_complete)
+
+    async def prune(self) -> None:
+        """Удаляет из журнала события старше срока хранения.
+        Последнее событие сохраняется, чтобы по журналу можно было
+        проверить полноту повтора.
+        """
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(seconds=self.retention)
+        async with LocalAsyncSession() as session:
+            last_id = select(func.max(UserEvent.id)).scalar_subquery()
+            stmt = delete(UserEvent).where(UserEvent.created_at < cutoff, UserEvent.id < last_id)
+            await session.execute(stmt)
+            await session.commit()
+
+    async def start(self) -> None:
+        """Определяет текущее смещение журнала и запускает его очистку."""
+        async with LocalAsyncSession() as session:
+            self._cursor = await session.scalar(select(func.max(UserEvent.id))) or 0
+
+        self._prune_task.start()
+
+    async def stop(self) -> None:
+        """Останавливает очистку журнала."""
+        await self._prune_task.stop()
+
+
+user_events = UserEventsHub(
+    retention=configs.user_events.RETENTION,
+    prune_interval=configs.user_events.PRUNE_INTERVAL,
+    replay_limit=configs.user_events.REPLAY_LIMIT,
+    replay_lookback=configs.user_events.REPLAY_LOOKBACK,
+    queue_size=configs.user_events.QUEUE_SIZE,
+)
+
+listener.subscribe(USER_EVENTS_CHANNEL, user_events.handle_notification)
+listener.on_reconnect(user_events.handle_reconnect)
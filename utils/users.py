@@ -0,0 +1,286 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, any_, bindparam, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Password, User
+
+from .cache import UserSnapshot, user_cache
+
+# Запросы короче длины триграммы не могут использовать триграммный индекс
+TRIGRAM_SEARCH_MIN_LENGTH = 3
+
+
+def user_snapshot_stmt(criteria: ColumnElement[bool]) -> Select:
+    """Формирует запрос снимка пользователя вместе с хешем его пароля.
+
+    Args:
+        criteria (ColumnElement[bool]): Условие поиска пользователя.
+
+    Returns:
+        Select: Запрос снимка пользователя.
+    """
+    return (
+        select(
+            User.id,
+            User.name,
+            User.email,
+            User.is_admin,
+            User.is_disabled,
+            User.version,
+            Password.hash.label("password_hash"),
+        )
+        .outerjoin(Password, Password.user_id == User.id)
+        .where(criteria)
+    )
+
+
+def users_by_ids_criteria(user_ids: list[UUID]) -> ColumnElement[bool]:
+    """Формирует условие поиска пользователей по списку UUID.
+
+    Список передается одним параметром-массивом (`id = ANY($1)`), поэтому
+    текст запроса не зависит от количества идентификаторов.
+
+    Args:
+        user_ids (list[UUID]): UUID пользователей.
+
+    Returns:
+        ColumnElement[bool]: Условие поиска пользователей.
+    """
+    ids_type = ARRAY(PG_UUID(as_uuid=True))
+    return User.id == any_(cast(bindparam("user_ids", user_ids, type_=ids_type), ids_type))
+
+
+def escape_like(value: str) -> str:
+    """Экранирует спецсимволы шаблона LIKE.
+
+    Args:
+        value (str): Исходная строка.
+
+    Returns:
+        str: Строка, пригодная для подстановки в шаблон LIKE с экранированием `\\`.
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def users_search_criteria(
+    q: Optional[str] = None,
+    is_admin: Optional[bool] = None,
+    is_disabled: Optional[bool] = None,
+) -> list[ColumnElement[bool]]:
+    """Формирует условия поиска и фильтрации пользователей.
+
+    Короткие запросы ищутся по префиксу имени или почты без учета регистра
+    (индексы `text_pattern_ops` по `lower()`), остальные по подстроке
+    (триграммные GIN индексы).
+
+    Args:
+        q (Optional[str]): Поисковый запрос по имени или электронной почте.
+        is_admin (Optional[bool]): Флаг админ прав.
+        is_disabled (Optional[bool]): Флаг блокировки.
+
+    Returns:
+        list[ColumnElement[bool]]: Условия поиска.
+    """
+    criteria = []
+    if q:
+        pattern = escape_like(q.lower())
+        if len(q) < TRIGRAM_SEARCH_MIN_LENGTH:
+            criteria.append(
+                or_(
+                    func.lower(User.name).like(f"{pattern}%", escape="\\"),
+                    func.lower(User.email).like(f"{pattern}%", escape="\\"),
+                )
+            )
+        else:
+            criteria.append(
+                or_(
+                    User.name.ilike(f"%{pattern}%", escape="\\"),
+                    User.email.ilike(f"%{pattern}%", escape="\\"),
+                )
+            )
+
+    if is_admin is not None:
+        criteria.append(User.is_admin == is_admin)
+
+    if is_disabled is not None:
+        criteria.append(User.is_disabled == is_disabled)
+
+    return criteria
+
+
+def users_page_stmt(skip: int, size: int, *criteria: ColumnElement[bool]) -> Select:
+    """Формирует запрос страницы списка пользователей.
+    Сортировка по уникальному имени делает страницы стабильными.
+
+    Args:
+        skip (int): Количество записей на пропуск.
+        size (int): Размер страницы.
+        *criteria (ColumnElement[bool]): Условия поиска пользователей.
+
+    Returns:
+        Select: Запрос страницы пользователей.
+    """
+    return select(User).where(*criteria).order_by(User.name).offset(skip).limit(size)
+
+
+def users_versions_stmt(skip: int, size: int, *criteria: ColumnElement[bool]) -> Select:
+    """Формирует запрос идентификаторов и версий записей страницы списка пользователей.
+    Порядок записей совпадает с `users_page_stmt`.
+
+    Args:
+        skip (int): Количество записей на пропуск.
+        size (int): Размер страницы.
+        *criteria (ColumnElement[bool]): Условия поиска пользователей.
+
+    Returns:
+        Select: Запрос версий записей страницы.
+    """
+    return (
+        select(User.id, User.version)
+        .where(*criteria)
+        .order_by(User.name)
+        .offset(skip)
+        .limit(size)
+    )
+
+
+def users_count_stmt(*criteria: ColumnElement[bool]) -> Select:
+    """Формирует запрос общего количества пользователей.
+
+    Args:
+        *criteria (ColumnElement[bool]): Условия поиска пользователей.
+
+    Returns:
+        Select: Запрос количества пользователей.
+    """
+    return select(func.count()).select_from(User).where(*criteria)
+
+
+def user_exists_stmt(name: str, email: str) -> Select:
+    """Формирует запрос наличия пользователя с таким же именем или электронной почтой.
+
+    Args:
+        name (str): Имя пользователя.
+        email (str): Электронная почта пользователя.
+
+    Returns:
+        Select: Запрос наличия пользователя.
+    """
+    return select(select(User.id).where(or_(User.name == name, User.email == email)).exists())
+
+
+async def load_user_snapshot(
+    db: AsyncSession, criteria: ColumnElement[bool]
+) -> Optional[UserSnapshot]:
+    """Загружает снимок пользователя из базы данных в обход кэша.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия подключения к базе данных.
+        criteria (ColumnElement[bool]): Условие поиска пользователя.
+
+    Returns:
+        Optional[UserSnapshot]: Снимок пользователя.
+    """
+    stmt = user_snapshot_stmt(criteria)
+    result = await db.execute(stmt)
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    return UserSnapshot(**row._asdict())
+
+
+async def load_user_snapshots(
+    db: AsyncSession, criteria: ColumnElement[bool]
+) -> list[UserSnapshot]:
+    """Загружает снимки пользователей из базы данных в обход кэша.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия подключения к базе данных.
+        criteria (ColumnElement[bool]): Условие поиска пользователей.
+
+    Returns:
+        list[UserSnapshot]: Снимки пользователей.
+    """
+    stmt = user_snapshot_stmt(criteria)
+    result = await db.execute(stmt)
+    return [UserSnapshot(**row._asdict()) for row in result]
+
+
+async def fetch_user(db: AsyncSession, user_id: UUID) -> Optional[UserSnapshot]:
+    """Возвращает снимок пользователя по его UUID, обращаясь к базе данных
+    только при промахе кэша.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия подключения к базе данных.
+        user_id (UUID): UUID пользователя.
+
+    Returns:
+        Optional[UserSnapshot]: Снимок пользователя.
+    """
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    generation = user_cache.generation
+    user = await load_user_snapshot(db, User.id == user_id)
+    if user is not None:
+        user_cache.put(user, generation)
+
+    return user
+
+
+async def fetch_user_by_name(db: AsyncSession, name: str) -> Optional[UserSnapshot]:
+    """Возвращает снимок пользователя по его имени, обращаясь к базе данных
+    только при промахе кэша.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия подключения к базе данных.
+        name (str): Имя пользователя.
+
+    Returns:
+        Optional[UserSnapshot]: Снимок пользователя.
+    """
+    user = user_cache.get_by_name(name)
+    if user is not None:
+        return user
+
+    generation = user_cache.generation
+    user = await load_user_snapshot(db, User.name == name)
+    if user is not None:
+        user_cache.put(user, generation)
+
+    return user
+
+
+async def fetch_users(db: AsyncSession, user_ids: list[UUID]) -> dict[UUID, UserSnapshot]:
+    """Возвращает снимки пользователей по их UUID. Пользователи, отсутствующие
+    в кэше, загружаются из базы данных одним запросом.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия подключения к базе данных.
+        user_ids (list[UUID]): UUID пользователей.
+
+    Returns:
+        dict[UUID, UserSnapshot]: Снимки найденных пользователей по их UUID.
+    """
+    users, misses = {}, []
+    for user_id in dict.fromkeys(user_ids):
+        user = user_cache.get(user_id)
+        if user is not None:
+            users[user_id] = user
+        else:
+            misses.append(user_id)
+
+    if not misses:
+        return users
+
+    generation = user_cache.generation
+    for user in await load_user_snapshots(db, users_by_ids_criteria(misses)):
+        user_cache.put(user, generation)
+        users[user.id] = user
+
+    return users